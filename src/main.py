@@ -27,7 +27,13 @@ from gi.repository import Adw, Gtk, Gio, GLib, Gdk
 from .window import TaunoMonitorWindow
 from .preferences import TaunoPreferencesWindow
 import os
+import threading
 import gettext, locale
+from .tauno_recovery import open_files, recover_files
+from .tauno_trace import get_tracer
+from . import tauno_trace
+
+trace = get_tracer('app')
 
 APP_VERSION = '0.2.20'
 APP_ID = 'art.taunoerik.tauno-monitor'
@@ -50,6 +56,11 @@ class TaunoMonitorApplication(Adw.Application):
 
         self.settings = Gio.Settings(schema_id=APP_ID)
 
+        # Trace messages (tauno_trace.py)
+        tauno_trace.configure_from_settings(self.settings)
+        for key in ("trace-level", "trace-categories", "trace-ring-size"):
+            self.settings.connect("changed::" + key, self.on_trace_settings_changed)
+
         # menu actions
         self.create_action('quit', lambda *_: self.quit(), ['<primary>q'])
         self.create_action('about', self.on_about_action)
@@ -98,8 +109,34 @@ class TaunoMonitorApplication(Adw.Application):
         Called when the application is activated.
         We raise the application's main window, creating it if necessary.
         """
+        first_window = self.props.active_window is None
         self.win = TaunoMonitorWindow(application=self)
         self.win.present()
+        if first_window:
+            self.start_recovery(self.win)
+
+    def start_recovery(self, window):
+        """
+        Repair logs left open by a crash (tauno_recovery.py).
+        Files are listed before any window starts logging.
+        """
+        folder = os.path.expanduser(self.settings.get_string("log-folder"))
+        if not os.path.isdir(folder):
+            return
+        file_paths = open_files(folder)
+        if file_paths:
+            threading.Thread(target=self.recover, args=(file_paths, window),
+                             daemon=True).start()
+
+    def recover(self, file_paths, window):
+        """ Recovery thread """
+        results = recover_files(file_paths)
+        if not results:
+            return
+        lost = sum(result.lost for result in results)
+        message = f"Recovered {len(results)} log file(s) left open, {lost} bytes lost"
+        trace.warning(message)
+        GLib.idle_add(window.notify, message)
 
     def on_new_window(self):
         # This function is called when the "new-window" action is triggered
@@ -107,7 +144,7 @@ class TaunoMonitorApplication(Adw.Application):
 
     def on_newwindow(self, widget, param):
         """App Menu New Window action """
-        print("New Window")
+        trace.info("New Window")
         self.do_activate()
 
 
@@ -152,6 +189,9 @@ class TaunoMonitorApplication(Adw.Application):
         tool_baud.present()
 
 
+    def on_trace_settings_changed(self, settings, key):
+        tauno_trace.configure_from_settings(settings)
+
     def on_about_action(self, widget, param):
         """Callback for the app.about action."""
         about = Adw.AboutWindow(transient_for=self.props.active_window,
@@ -1,11 +1,18 @@
 # File:        preferences.py
 # Started:     03.08.2024
-# Edited:      09.02.2026
+# Edited:      18.10.2026
 # Author:      Tauno Erik
 # Description: Displays Preferences window
 
 from gi.repository import Adw, Gtk, Gio, GObject, GLib, Gdk
 import os
+from .tauno_framing import FRAMING_MODES
+from .tauno_logging import LOG_FORMATS, LOG_SPLITS
+from .tauno_rx_queue import OVERFLOW_POLICIES
+from .tauno_rotation import ROTATE_NAMINGS, COMPRESSIONS
+from .tauno_trace import get_tracer, TRACE_LEVELS
+
+trace = get_tracer('preferences')
 
 @Gtk.Template(resource_path='/art/taunoerik/tauno-monitor/preferences.ui')
 class TaunoPreferencesWindow(Adw.PreferencesWindow):
@@ -36,10 +43,33 @@ class TaunoPreferencesWindow(Adw.PreferencesWindow):
     show_line_end_switch = Gtk.Template.Child()
     show_line_end_color_button = Gtk.Template.Child()
     reset_line_end_color_button = Gtk.Template.Child()
+    scrollback_lines_spin_button = Gtk.Template.Child()
+    scrollback_size_spin_button = Gtk.Template.Child()
+    rx_queue_size_spin_button = Gtk.Template.Child()
+    rx_queue_overflow_dropdown = Gtk.Template.Child()
 
     # Logging
     log_folder_entry = Gtk.Template.Child()
     select_log_folder_button = Gtk.Template.Child()
+    log_format_dropdown = Gtk.Template.Child()
+    log_split_dropdown = Gtk.Template.Child()
+    log_flush_interval_spin_button = Gtk.Template.Child()
+    log_fsync_switch = Gtk.Template.Child()
+    log_sync_interval_spin_button = Gtk.Template.Child()
+    log_index_interval_spin_button = Gtk.Template.Child()
+    log_rotate_size_spin_button = Gtk.Template.Child()
+    log_rotate_interval_spin_button = Gtk.Template.Child()
+    log_rotate_naming_dropdown = Gtk.Template.Child()
+    log_compression_dropdown = Gtk.Template.Child()
+    log_keep_segments_spin_button = Gtk.Template.Child()
+
+    # Replay
+    replay_speed_spin_button = Gtk.Template.Child()
+
+    # Trace
+    trace_level_dropdown = Gtk.Template.Child()
+    trace_categories_entry = Gtk.Template.Child()
+    trace_ring_size_spin_button = Gtk.Template.Child()
 
     # Serial
     data_bits_dropdown = Gtk.Template.Child()
@@ -48,6 +78,14 @@ class TaunoPreferencesWindow(Adw.PreferencesWindow):
     reset_parity_button = Gtk.Template.Child()
     stop_bits_dropdown = Gtk.Template.Child()
     reset_stop_bits_button = Gtk.Template.Child()
+
+    # RX Framing
+    framing_dropdown = Gtk.Template.Child()
+    frame_delimiter_entry = Gtk.Template.Child()
+    frame_length_spin_button = Gtk.Template.Child()
+    frame_prefix_dropdown = Gtk.Template.Child()
+    frame_idle_spin_button = Gtk.Template.Child()
+
     #tx_line_end_dropdown = Gtk.Template.Child()
     #reset_tx_line_end_button = Gtk.Template.Child()
     #rx_line_end_dropdown = Gtk.Template.Child()
@@ -101,11 +139,55 @@ class TaunoPreferencesWindow(Adw.PreferencesWindow):
 
         self.show_line_end_switch.set_active(self.settings.get_boolean("show-line-end"))
 
+        self.scrollback_lines_spin_button.get_adjustment().set_value(self.settings.get_int("scrollback-lines"))
+        self.scrollback_size_spin_button.get_adjustment().set_value(self.settings.get_int("scrollback-size"))
+        self.rx_queue_size_spin_button.get_adjustment().set_value(self.settings.get_int("rx-queue-size"))
+        self.rx_queue_overflow_dropdown.set_model(Gtk.StringList.new(['Drop Oldest', 'Drop Newest']))
+        rx_queue_overflow = self.settings.get_string("rx-queue-overflow")
+        if rx_queue_overflow in OVERFLOW_POLICIES:
+            self.rx_queue_overflow_dropdown.set_selected(OVERFLOW_POLICIES.index(rx_queue_overflow))
+
         # --- Logging ---
         # Get saved log folder
         self.log_folder_path = self.settings.get_string("log-folder")
         log_buffer = self.log_folder_entry.get_buffer()
         log_buffer.set_text(self.log_folder_path, -1)
+        self.log_formats = ['Text', 'Capture', 'Text and Capture', 'JSON Lines', 'CSV']
+        self.log_format_dropdown.set_model(Gtk.StringList.new(self.log_formats))
+        log_format = self.settings.get_string("log-format")
+        if log_format in LOG_FORMATS:
+            self.log_format_dropdown.set_selected(LOG_FORMATS.index(log_format))
+        self.log_split_dropdown.set_model(Gtk.StringList.new(['One File', 'RX and TX', 'Per Port']))
+        log_split = self.settings.get_string("log-split")
+        if log_split in LOG_SPLITS:
+            self.log_split_dropdown.set_selected(LOG_SPLITS.index(log_split))
+        self.log_flush_interval_spin_button.get_adjustment().set_value(self.settings.get_int("log-flush-interval"))
+        self.log_fsync_switch.set_active(self.settings.get_boolean("log-fsync"))
+        self.log_sync_interval_spin_button.get_adjustment().set_value(self.settings.get_int("log-sync-interval"))
+        self.log_index_interval_spin_button.get_adjustment().set_value(self.settings.get_int("log-index-interval"))
+        self.log_rotate_size_spin_button.get_adjustment().set_value(self.settings.get_int("log-rotate-size"))
+        self.log_rotate_interval_spin_button.get_adjustment().set_value(self.settings.get_int("log-rotate-interval"))
+        self.log_rotate_naming_dropdown.set_model(Gtk.StringList.new(['Numbered', 'Timestamp']))
+        naming = self.settings.get_string("log-rotate-naming")
+        if naming in ROTATE_NAMINGS:
+            self.log_rotate_naming_dropdown.set_selected(ROTATE_NAMINGS.index(naming))
+        self.log_compression_dropdown.set_model(Gtk.StringList.new(['None', 'gzip', 'xz']))
+        compression = self.settings.get_string("log-compression")
+        if compression in COMPRESSIONS:
+            self.log_compression_dropdown.set_selected(COMPRESSIONS.index(compression))
+        self.log_keep_segments_spin_button.get_adjustment().set_value(self.settings.get_int("log-keep-segments"))
+
+        # --- Replay ---
+        self.replay_speed_spin_button.get_adjustment().set_value(self.settings.get_double("replay-speed"))
+
+        # --- Trace ---
+        self.trace_levels = list(TRACE_LEVELS)
+        self.trace_level_dropdown.set_model(Gtk.StringList.new(['Off', 'Error', 'Warning', 'Info', 'Debug']))
+        trace_level = self.settings.get_string("trace-level")
+        if trace_level in self.trace_levels:
+            self.trace_level_dropdown.set_selected(self.trace_levels.index(trace_level))
+        self.trace_categories_entry.get_buffer().set_text(self.settings.get_string("trace-categories"), -1)
+        self.trace_ring_size_spin_button.get_adjustment().set_value(self.settings.get_int("trace-ring-size"))
 
         # --- Serial ---
         # Serial byte sizes
@@ -128,6 +210,24 @@ class TaunoPreferencesWindow(Adw.PreferencesWindow):
         self.stop_bits_dropdown.set_model(Gtk.StringList.new(self.serial_stop_bits))
         self.stop_bits_dropdown.set_selected(self.get_stop_bit_saved)
 
+        # --- RX Framing ---
+        self.framing_names = ['Line End', 'Delimiter', 'Fixed Length', 'Length Prefix', 'Idle Gap']
+        self.framing_dropdown.set_model(Gtk.StringList.new(self.framing_names))
+        framing = self.settings.get_string("rx-framing")
+        if framing in FRAMING_MODES:
+            self.framing_dropdown.set_selected(FRAMING_MODES.index(framing))
+
+        self.frame_delimiter_entry.get_buffer().set_text(self.settings.get_string("rx-frame-delimiter"), -1)
+        self.frame_length_spin_button.get_adjustment().set_value(self.settings.get_int("rx-frame-length"))
+
+        self.frame_prefix_sizes = [1, 2, 4]
+        self.frame_prefix_dropdown.set_model(Gtk.StringList.new(['1 Byte', '2 Bytes', '4 Bytes']))
+        prefix_size = self.settings.get_int("rx-frame-prefix-size")
+        if prefix_size in self.frame_prefix_sizes:
+            self.frame_prefix_dropdown.set_selected(self.frame_prefix_sizes.index(prefix_size))
+
+        self.frame_idle_spin_button.get_adjustment().set_value(self.settings.get_int("rx-frame-idle-ms"))
+
         # Get TX line end index
         #self.get_TX_line_end_saved = self.settings.get_int("saved-serial-tx-line-end-index")
         #self.tx_line_end_dropdown.set_model(Gtk.StringList.new(self.win.serial_tx_line_endings))
@@ -176,8 +276,32 @@ class TaunoPreferencesWindow(Adw.PreferencesWindow):
         self.show_line_end_color_button.connect('notify::rgba', self.on_show_line_end_color_selected)
         self.reset_line_end_color_button.connect("clicked", self.reset_line_end_color_button_action)
 
+        self.scrollback_lines_spin_button.connect("value-changed", self.scrollback_lines_action)
+        self.scrollback_size_spin_button.connect("value-changed", self.scrollback_size_action)
+        self.rx_queue_size_spin_button.connect("value-changed", self.rx_queue_size_action)
+        self.rx_queue_overflow_dropdown.connect('notify::selected-item', self.rx_queue_overflow_action)
+
         # --- Logging ---
         self.select_log_folder_button.connect("clicked", self.select_log_folder_button_action)
+        self.log_format_dropdown.connect('notify::selected-item', self.log_format_action)
+        self.log_split_dropdown.connect('notify::selected-item', self.log_split_action)
+        self.log_flush_interval_spin_button.connect("value-changed", self.log_flush_interval_action)
+        self.log_fsync_switch.connect("state-set", self.log_fsync_switch_action)
+        self.log_sync_interval_spin_button.connect("value-changed", self.log_sync_interval_action)
+        self.log_index_interval_spin_button.connect("value-changed", self.log_index_interval_action)
+        self.log_rotate_size_spin_button.connect("value-changed", self.log_rotate_size_action)
+        self.log_rotate_interval_spin_button.connect("value-changed", self.log_rotate_interval_action)
+        self.log_rotate_naming_dropdown.connect('notify::selected-item', self.log_rotate_naming_action)
+        self.log_compression_dropdown.connect('notify::selected-item', self.log_compression_action)
+        self.log_keep_segments_spin_button.connect("value-changed", self.log_keep_segments_action)
+
+        # --- Replay ---
+        self.replay_speed_spin_button.connect("value-changed", self.replay_speed_action)
+
+        # --- Trace ---
+        self.trace_level_dropdown.connect('notify::selected-item', self.trace_level_action)
+        self.trace_categories_entry.connect('changed', self.trace_categories_action)
+        self.trace_ring_size_spin_button.connect("value-changed", self.trace_ring_size_action)
 
         # --- Serial ---
         self.data_bits_dropdown.connect('notify::selected-item', self.serial_data_bits_action)
@@ -189,6 +313,13 @@ class TaunoPreferencesWindow(Adw.PreferencesWindow):
         self.stop_bits_dropdown.connect('notify::selected-item', self.serial_stop_bits_action)
         self.reset_stop_bits_button.connect("clicked", self.reset_stop_bits_button_action)
 
+        # --- RX Framing ---
+        self.framing_dropdown.connect('notify::selected-item', self.framing_action)
+        self.frame_delimiter_entry.connect('changed', self.frame_delimiter_action)
+        self.frame_length_spin_button.connect("value-changed", self.frame_length_action)
+        self.frame_prefix_dropdown.connect('notify::selected-item', self.frame_prefix_action)
+        self.frame_idle_spin_button.connect("value-changed", self.frame_idle_action)
+
         #self.tx_line_end_dropdown.connect('notify::selected-item', self.serial_TX_line_end_action)
         #self.reset_tx_line_end_button.connect("clicked", self.reset_TX_line_end_button_action)
 
@@ -225,11 +356,11 @@ class TaunoPreferencesWindow(Adw.PreferencesWindow):
 
     def rx_data_format_action(self, drop_down, g_param_object):
         """ """
-        print("Change RX format")
+        trace.debug("Change RX format")
         string_object = drop_down.get_selected_item()
         index = drop_down.get_selected()
         new_format = string_object.get_string()
-        print(f'Position: {index} - value: {string_object.get_string()}')
+        trace.debug('Position: %s - value: %s', index, string_object.get_string())
         # save settings
         self.settings.set_string("saved-serial-rx-data-format", new_format)
         # update pos
@@ -238,23 +369,20 @@ class TaunoPreferencesWindow(Adw.PreferencesWindow):
         # End the HEX data block with a newline when starting ASCII
         if self.win.get_rx_format_saved != 'HEX':
             #print("HEX --> ASCII")
-            data = '\n'
-            self.win.insert_data_to_text_view(data.encode(), 'ASCII')
-            self.win.logging.hex_counter = 0;
-            self.win.logging.write_data('')
+            self.win.insert_text_to_text_view('\n')
 
 
     def reset_data_format_button_action(self, widget):
         """ """
-        print("Reset data format")
+        trace.debug("Reset data format")
         # Get deffault
         default = self.settings.get_string("default-serial-rx-data-format")
-        print(f"default:{default}")
+        trace.debug("default:%s", default)
         # Save setting
         self.settings.set_string("saved-serial-rx-data-format", default)
         # Reload UI
         index = self.serial_data_formats.index(default)
-        print(f"index:{index}")
+        trace.debug("index:%s", index)
         self.rx_format_dropdown.set_selected(position=index)#TODO
 
 
@@ -268,7 +396,7 @@ class TaunoPreferencesWindow(Adw.PreferencesWindow):
     def on_time_color_selected(self, color_dialog_button, g_param_boxed):
         """ Get and save time tag color """
         gdk_rgba = color_dialog_button.get_rgba()
-        print("New Time color " + gdk_rgba.to_string())
+        trace.debug("New Time color %s", gdk_rgba.to_string())
         # Save color settings
         self.settings.set_string("saved-time-color", gdk_rgba.to_string())
         # Update tag
@@ -293,7 +421,7 @@ class TaunoPreferencesWindow(Adw.PreferencesWindow):
     def on_arrow_color_selected(self, color_dialog_button, g_param_boxed):
         """ Get and save Arrow tag color """
         gdk_rgba = color_dialog_button.get_rgba()
-        print("New Arrow color " + gdk_rgba.to_string())
+        trace.debug("New Arrow color %s", gdk_rgba.to_string())
         # Save color settings
         self.settings.set_string("saved-arrow-color", gdk_rgba.to_string())
         # Update tag
@@ -301,7 +429,7 @@ class TaunoPreferencesWindow(Adw.PreferencesWindow):
 
 
     def reset_arrow_color_button_action(self, widget):
-        print("Reset arrow color")
+        trace.debug("Reset arrow color")
         default_color = Gdk.RGBA()
         default_color.parse(self.settings.get_string("default-arrow-color"))
         self.settings.set_string("saved-arrow-color", default_color.to_string())
@@ -310,7 +438,7 @@ class TaunoPreferencesWindow(Adw.PreferencesWindow):
     def on_out_color_selected(self, color_dialog_button, g_param_boxed):
         """ Get and save Out tag color """
         gdk_rgba = color_dialog_button.get_rgba()
-        print("New TX color " + gdk_rgba.to_string())
+        trace.debug("New TX color %s", gdk_rgba.to_string())
         # Save color settings
         self.settings.set_string("saved-out-color", gdk_rgba.to_string())
         # Update tag
@@ -328,7 +456,7 @@ class TaunoPreferencesWindow(Adw.PreferencesWindow):
     def on_in_color_selected(self, color_dialog_button, g_param_boxed):
         """ Get and save In tag color """
         gdk_rgba = color_dialog_button.get_rgba()
-        print("New RX color " + gdk_rgba.to_string())
+        trace.debug("New RX color %s", gdk_rgba.to_string())
         # Save color settings
         self.settings.set_string("saved-in-color", gdk_rgba.to_string())
         # Update tag
@@ -358,7 +486,7 @@ class TaunoPreferencesWindow(Adw.PreferencesWindow):
         Get and save line end tag color
         """
         gdk_rgba = color_dialog_button.get_rgba()
-        print("Line End color " + gdk_rgba.to_string())
+        trace.debug("Line End color %s", gdk_rgba.to_string())
         # Save color settings
         self.settings.set_string("saved-show-line-end-color", gdk_rgba.to_string())
         # Update tag
@@ -366,13 +494,33 @@ class TaunoPreferencesWindow(Adw.PreferencesWindow):
 
 
     def reset_line_end_color_button_action(self, widget):
-        print("reset_line_end_color_button_action")
+        trace.debug("reset_line_end_color_button_action")
         default_color = Gdk.RGBA()
         default_color.parse(self.settings.get_string("default-show-line-end-color"))
         self.settings.set_string("saved-show-line-end-color", default_color.to_string())
         self.show_line_end_color_button.set_rgba(default_color)
 
 
+    def scrollback_lines_action(self, action):
+        """ Max lines kept in Text View, 0 = unlimited """
+        self.settings.set_int("scrollback-lines", action.get_value_as_int())
+
+
+    def scrollback_size_action(self, action):
+        """ Max size (KB) of Text View, 0 = unlimited """
+        self.settings.set_int("scrollback-size", action.get_value_as_int())
+
+
+    def rx_queue_size_action(self, action):
+        """ Max RX items waiting for display """
+        self.settings.set_int("rx-queue-size", action.get_value_as_int())
+
+
+    def rx_queue_overflow_action(self, drop_down, g_param_object):
+        """ Drop oldest or newest RX items from display when queue is full """
+        self.settings.set_string("rx-queue-overflow", OVERFLOW_POLICIES[drop_down.get_selected()])
+
+
     def select_log_folder_button_action(self, widget):
         """ Button to select logging folder action """
         self.filedialog.select_folder(
@@ -380,6 +528,82 @@ class TaunoPreferencesWindow(Adw.PreferencesWindow):
             callback=self.on_filedialog_select_folder)
 
 
+    def log_format_action(self, drop_down, g_param_object):
+        """ Text log, binary capture or both. Used when next log starts. """
+        index = drop_down.get_selected()
+        self.settings.set_string("log-format", LOG_FORMATS[index])
+
+
+    def log_split_action(self, drop_down, g_param_object):
+        """ One capture file, or one per direction or port. Used when next log starts. """
+        self.settings.set_string("log-split", LOG_SPLITS[drop_down.get_selected()])
+
+
+    def log_flush_interval_action(self, action):
+        """ How often (ms) log writer thread flushes the file """
+        self.settings.set_int("log-flush-interval", action.get_value_as_int())
+
+
+    def log_fsync_switch_action(self, widget, state):
+        """ fsync log file on every flush """
+        self.settings.set_boolean("log-fsync", state)
+
+
+    def log_sync_interval_action(self, action):
+        """ fsync log file at least every N seconds, 0 = off """
+        self.settings.set_int("log-sync-interval", action.get_value_as_int())
+
+
+    def log_index_interval_action(self, action):
+        """ Index entry every N lines or records, 0 = no index """
+        self.settings.set_int("log-index-interval", action.get_value_as_int())
+
+
+    def log_rotate_size_action(self, action):
+        """ New log file after this many MB, 0 = never """
+        self.settings.set_int("log-rotate-size", action.get_value_as_int())
+
+
+    def log_rotate_interval_action(self, action):
+        """ New log file after this many minutes, 0 = never """
+        self.settings.set_int("log-rotate-interval", action.get_value_as_int())
+
+
+    def log_rotate_naming_action(self, drop_down, g_param_object):
+        """ Rotated log files are numbered or timestamped """
+        self.settings.set_string("log-rotate-naming", ROTATE_NAMINGS[drop_down.get_selected()])
+
+
+    def log_compression_action(self, drop_down, g_param_object):
+        """ Compression of rotated log files """
+        self.settings.set_string("log-compression", COMPRESSIONS[drop_down.get_selected()])
+
+
+    def log_keep_segments_action(self, action):
+        """ Max number of log files per log, 0 = keep all """
+        self.settings.set_int("log-keep-segments", action.get_value_as_int())
+
+
+    def replay_speed_action(self, action):
+        """ Capture replay speed, 0 = as fast as possible """
+        self.settings.set_double("replay-speed", action.get_value())
+
+
+    def trace_level_action(self, drop_down, g_param_object):
+        """ Trace messages at this level and above are printed """
+        self.settings.set_string("trace-level", self.trace_levels[drop_down.get_selected()])
+
+
+    def trace_categories_action(self, entry):
+        """ Trace categories, comma separated """
+        self.settings.set_string("trace-categories", entry.get_buffer().get_text())
+
+
+    def trace_ring_size_action(self, action):
+        """ Trace messages kept in memory for Dump Trace, 0 = off """
+        self.settings.set_int("trace-ring-size", action.get_value_as_int())
+
+
     def serial_data_bits_action(self, drop_down, g_param_object):
         """
         Function called when Serial Data Bits selection is changed in App preferences
@@ -387,10 +611,10 @@ class TaunoPreferencesWindow(Adw.PreferencesWindow):
         # Get selected index
         string_object = drop_down.get_selected_item()
         index = drop_down.get_selected()
-        print(f'Selected Data Bit Pos: {index} val: {string_object.get_string()}')
+        trace.debug('Selected Data Bit Pos: %s val: %s', index, string_object.get_string())
         # Save index
         if self.win.get_data_bit_saved != index:
-            print("Saving Serial Data Bit index")
+            trace.debug("Saving Serial Data Bit index")
             self.settings.set_int("saved-serial-data-bit-index", index)
             # Reload setting
             self.win.get_data_bit_saved = self.settings.get_int("saved-serial-data-bit-index")
@@ -401,7 +625,7 @@ class TaunoPreferencesWindow(Adw.PreferencesWindow):
         Function to reset Serial Data Bit to default value
         """
         defalut_value = self.settings.get_int("default-serial-data-bit-index")
-        print(f"Reset Data Bit index to: {defalut_value}")
+        trace.debug("Reset Data Bit index to: %s", defalut_value)
         # save setting
         self.settings.set_int("saved-serial-data-bit-index", defalut_value)
         # reload setting
@@ -417,10 +641,10 @@ class TaunoPreferencesWindow(Adw.PreferencesWindow):
         # Get selected index
         string_object = drop_down.get_selected_item()
         index = drop_down.get_selected()
-        print(f'Selected Parity Pos: {index} val: {string_object.get_string()}')
+        trace.debug('Selected Parity Pos: %s val: %s', index, string_object.get_string())
         # Save index
         if self.win.get_parity_saved != index:
-            print("Saving Serial Parity index")
+            trace.debug("Saving Serial Parity index")
             self.settings.set_int("saved-serial-parity-index", index)
             # Reload setting
             self.win.get_parity_saved = self.settings.get_int("saved-serial-parity-index")
@@ -431,7 +655,7 @@ class TaunoPreferencesWindow(Adw.PreferencesWindow):
         Function to reset Serial Parity to default value
         """
         defalut_value = self.settings.get_int("default-serial-parity-index")
-        print(f"Reset Parity index to: {defalut_value}")
+        trace.debug("Reset Parity index to: %s", defalut_value)
         # Save setting
         self.settings.set_int("saved-serial-parity-index", defalut_value)
         # reload setting
@@ -447,10 +671,10 @@ class TaunoPreferencesWindow(Adw.PreferencesWindow):
         # Get selected index
         string_object = drop_down.get_selected_item()
         index = drop_down.get_selected()
-        print(f'Selected Stop Bit Pos: {index} val: {string_object.get_string()}')
+        trace.debug('Selected Stop Bit Pos: %s val: %s', index, string_object.get_string())
         # Save index
         if self.win.get_stop_bit_saved != index:
-            print("Saving Serial Stop Bit index")
+            trace.debug("Saving Serial Stop Bit index")
             self.settings.set_int("saved-serial-stop-bit-index", index)
             # Reload setting
             self.win.get_stop_bit_saved = self.settings.get_int("saved-serial-stop-bit-index")
@@ -461,7 +685,7 @@ class TaunoPreferencesWindow(Adw.PreferencesWindow):
         Function to reset Serial Stop Bit to default value
         """
         defalut_value = self.settings.get_int("default-serial-stop-bit-index")
-        print(f"Reset Stop Bit index to: {defalut_value}")
+        trace.debug("Reset Stop Bit index to: %s", defalut_value)
         # save setting
         self.settings.set_int("saved-serial-stop-bit-index", defalut_value)
         # reload setting
@@ -470,6 +694,36 @@ class TaunoPreferencesWindow(Adw.PreferencesWindow):
         self.stop_bits_dropdown.set_selected(position=defalut_value)
 
 
+    def framing_action(self, drop_down, g_param_object):
+        """ How received data is cut into frames """
+        index = drop_down.get_selected()
+        trace.debug('Selected RX framing: %s', FRAMING_MODES[index])
+        self.settings.set_string("rx-framing", FRAMING_MODES[index])
+
+
+    def frame_delimiter_action(self, entry):
+        """ Frame delimiter for 'Delimiter' framing """
+        text = entry.get_buffer().get_text()
+        if text:
+            self.settings.set_string("rx-frame-delimiter", text)
+
+
+    def frame_length_action(self, action):
+        """ Frame size for 'Fixed Length' framing """
+        self.settings.set_int("rx-frame-length", action.get_value_as_int())
+
+
+    def frame_prefix_action(self, drop_down, g_param_object):
+        """ Length prefix size for 'Length Prefix' framing """
+        index = drop_down.get_selected()
+        self.settings.set_int("rx-frame-prefix-size", self.frame_prefix_sizes[index])
+
+
+    def frame_idle_action(self, action):
+        """ Idle gap for 'Idle Gap' framing """
+        self.settings.set_int("rx-frame-idle-ms", action.get_value_as_int())
+
+
     def serial_TX_line_end_action(self, drop_down, g_param_object):
         """
         Function called when Serial Line End selection is changed in App preferences
@@ -477,10 +731,10 @@ class TaunoPreferencesWindow(Adw.PreferencesWindow):
         # Get selected index
         string_object = drop_down.get_selected_item()
         index = drop_down.get_selected()
-        print(f'Selected Line End Pos: {index} val: {string_object.get_string()}')
+        trace.debug('Selected Line End Pos: %s val: %s', index, string_object.get_string())
         # Save index
         if self.win.get_TX_line_end_saved != index:
-            print("Saving Serial Line End index")
+            trace.debug("Saving Serial Line End index")
             self.settings.set_int("saved-serial-tx-line-end-index", index)
             # Reload setting
             self.win.get_TX_line_end_saved = self.settings.get_int("saved-serial-tx-line-end-index")
@@ -491,7 +745,7 @@ class TaunoPreferencesWindow(Adw.PreferencesWindow):
         Function to reset Serial Line End to default value
         """
         defalut_value = self.settings.get_int("default-serial-tx-line-end-index")
-        print(f"Reset Line End index to: {defalut_value}")
+        trace.debug("Reset Line End index to: %s", defalut_value)
         # save setting
         self.settings.set_int("saved-serial-tx-line-end-index", defalut_value)
         # reload setting
@@ -508,10 +762,10 @@ class TaunoPreferencesWindow(Adw.PreferencesWindow):
         # Get selected index
         string_object = drop_down.get_selected_item()
         index = drop_down.get_selected()
-        print(f'Selected Line End Pos: {index} val: {string_object.get_string()}')
+        trace.debug('Selected Line End Pos: %s val: %s', index, string_object.get_string())
         # Save index
         if self.win.get_RX_line_end_saved != index:
-            print("Saving Serial Line End index")
+            trace.debug("Saving Serial Line End index")
             self.settings.set_int("saved-serial-rx-line-end-index", index)
             # Reload setting
             self.win.get_RX_line_end_saved = self.settings.get_int("saved-serial-rx-line-end-index")
@@ -523,7 +777,7 @@ class TaunoPreferencesWindow(Adw.PreferencesWindow):
         RX
         """
         defalut_value = self.settings.get_int("default-serial-rx-line-end-index")
-        print(f"Reset Line End index to: {defalut_value}")
+        trace.debug("Reset Line End index to: %s", defalut_value)
         # save setting
         self.settings.set_int("saved-serial-rx-line-end-index", defalut_value)
         # reload setting
@@ -0,0 +1,268 @@
+# File:    tauno_capture.py
+# Author:  Tauno Erik
+# Started: 18.10.2026
+# Edited:  18.10.2026
+# Binary capture file (.tmcap): raw bytes with nanosecond timestamps.
+#
+# File layout (little endian):
+#   Header: magic b'TMCAP\0', version u16,
+#           start wall time ns u64, start monotonic ns u64
+#   Records: payload length u32, monotonic ns u64, direction u8, port id u8,
+#            CRC-32 u32, payload bytes
+# Direction 0 = RX, 1 = TX, 255 = port name: gives port id a name,
+# payload is the UTF-8 port name. Every record costs 18 bytes.
+# CRC-32 is over the first 14 record bytes and the payload, so a record
+# half written when the power went off is found (see tauno_recovery.py).
+
+import heapq
+import mmap
+import struct
+import threading
+import time
+from collections import namedtuple
+from operator import attrgetter
+from zlib import crc32
+from .tauno_session import RX, TX
+
+CAPTURE_EXTENSION = '.tmcap'
+CAPTURE_MAGIC = b'TMCAP\0'
+CAPTURE_VERSION = 2
+
+HEADER = struct.Struct('<6sHQQ')
+RECORD = struct.Struct('<IQBBI')
+# Record fields covered by the checksum
+RECORD_FIELDS = struct.Struct('<IQBB')
+CHECKSUM = struct.Struct('<I')
+
+# Direction codes in file
+DIRECTION_CODES = {RX: 0, TX: 1}
+DIRECTIONS = {code: name for name, code in DIRECTION_CODES.items()}
+PORT_NAME = 255
+
+# Max port ids in one file
+MAX_PORTS = 255
+
+# offset: record start in file
+# data:   payload bytes
+CaptureRecord = namedtuple('CaptureRecord', ['offset', 'mono_ns', 'direction', 'port', 'data'])
+
+
+class CaptureError(Exception):
+    """ File is not a capture file or has unknown version """
+
+
+def make_header(wall_ns=None, mono_ns=None):
+    """ Header for a new capture file """
+    if wall_ns is None:
+        wall_ns = time.time_ns()
+    if mono_ns is None:
+        mono_ns = time.monotonic_ns()
+    return HEADER.pack(CAPTURE_MAGIC, CAPTURE_VERSION, wall_ns, mono_ns)
+
+
+def pack_record(mono_ns, code, port_id, data):
+    """ Record header and payload """
+    fields = RECORD_FIELDS.pack(len(data), mono_ns, code, port_id)
+    return fields + CHECKSUM.pack(crc32(data, crc32(fields))) + data
+
+
+class CaptureEncoder():
+    """
+    Makes capture records from Frame objects (tauno_session.py).
+    Port names are given ids on first use.
+    Safe to call from RX reader and GTK (TX) threads.
+    """
+
+    def __init__(self):
+        self.port_ids = {}
+        self.lock = threading.Lock()
+
+
+    def encode(self, frames):
+        """ Capture records for frames as one bytes object """
+        parts = []
+        with self.lock:
+            port_ids = self.port_ids
+            for frame in frames:
+                port_id = port_ids.get(frame.port)
+                if port_id is None:
+                    port_id = self.add_port(frame.port, parts)
+                parts.append(pack_record(frame.mono_ns, DIRECTION_CODES[frame.direction],
+                                         port_id, frame.data))
+        return b''.join(parts)
+
+
+    def port_records(self):
+        """ Port name records for all known ports, for a new file """
+        parts = []
+        with self.lock:
+            for port, port_id in self.port_ids.items():
+                name = str(port).encode('utf-8')
+                parts.append(pack_record(time.monotonic_ns(), PORT_NAME, port_id, name))
+        return b''.join(parts)
+
+
+    def add_port(self, port, parts):
+        """ New port id, port name record is added to parts """
+        port_id = len(self.port_ids) % MAX_PORTS
+        self.port_ids[port] = port_id
+        name = str(port).encode('utf-8')
+        parts.append(pack_record(time.monotonic_ns(), PORT_NAME, port_id, name))
+        return port_id
+
+
+class CaptureReader():
+    """
+    Reads a capture file with mmap, records are not loaded into memory.
+    Reading stops at a record cut short or damaged by a crash,
+    truncated is then set to True.
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.file_handle = open(file_path, 'rb')
+        try:
+            self.map = mmap.mmap(self.file_handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty file
+            self.file_handle.close()
+            raise CaptureError("Empty capture file")
+
+        if len(self.map) < HEADER.size:
+            self.close()
+            raise CaptureError("Capture header is missing")
+        magic, version, self.start_wall_ns, self.start_mono_ns = HEADER.unpack_from(self.map, 0)
+        if magic != CAPTURE_MAGIC:
+            self.close()
+            raise CaptureError("Not a capture file")
+        if version != CAPTURE_VERSION:
+            self.close()
+            raise CaptureError(f"Unknown capture version: {version}")
+
+        # port id: port name, filled while reading
+        self.ports = {}
+        self.truncated = False
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *args):
+        self.close()
+
+
+    def __iter__(self):
+        return self.records()
+
+
+    def close(self):
+        self.map.close()
+        self.file_handle.close()
+
+
+    def wall_time(self, mono_ns):
+        """ time.time() value for record timestamp """
+        return (self.start_wall_ns + mono_ns - self.start_mono_ns) / 1e9
+
+
+    def record_at(self, offset):
+        """ Record starting at offset, None at the end of file """
+        data_map = self.map
+        size = len(data_map)
+        if offset + RECORD.size > size:
+            if offset < size:
+                self.truncated = True
+            return None
+        length, mono_ns, code, port_id, checksum = RECORD.unpack_from(data_map, offset)
+        start = offset + RECORD.size
+        if start + length > size:
+            self.truncated = True
+            return None
+        data = data_map[start:start + length]
+        if crc32(data, crc32(data_map[offset:offset + RECORD_FIELDS.size])) != checksum:
+            self.truncated = True
+            return None
+        if code == PORT_NAME:
+            self.ports[port_id] = data.decode('utf-8', 'replace')
+            return CaptureRecord(offset, mono_ns, PORT_NAME, port_id, data)
+        return CaptureRecord(offset, mono_ns, DIRECTIONS.get(code, code),
+                             self.ports.get(port_id, port_id), data)
+
+
+    def records(self, offset=HEADER.size, port_names=False):
+        """
+        Iterate data records from offset.
+        port_names: also give port name records
+        """
+        record_at = self.record_at
+        while True:
+            record = record_at(offset)
+            if record is None:
+                return
+            offset += RECORD.size + len(record.data)
+            if record.direction != PORT_NAME or port_names:
+                yield record
+
+
+class MergedCapture():
+    """
+    Reads capture streams of one log (e.g. name.rx.tmcap and
+    name.tx.tmcap, see StreamSplitter in tauno_logging.py) as one
+    capture: records of all files in time order, k-way merged.
+    """
+
+    def __init__(self, file_paths):
+        self.readers = []
+        try:
+            for file_path in file_paths:
+                self.readers.append(CaptureReader(file_path))
+        except (OSError, CaptureError):
+            self.close()
+            raise
+        if not self.readers:
+            raise CaptureError("No capture files")
+        first = self.readers[0]
+        self.file_path = first.file_path
+        self.start_wall_ns = first.start_wall_ns
+        self.start_mono_ns = first.start_mono_ns
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *args):
+        self.close()
+
+
+    def __iter__(self):
+        return self.records()
+
+
+    @property
+    def truncated(self):
+        return any(reader.truncated for reader in self.readers)
+
+
+    def close(self):
+        for reader in self.readers:
+            reader.close()
+
+
+    def wall_time(self, mono_ns):
+        """ time.time() value for record timestamp """
+        return (self.start_wall_ns + mono_ns - self.start_mono_ns) / 1e9
+
+
+    def records(self, port_names=False):
+        """ Records of all files by monotonic time """
+        return heapq.merge(*[reader.records(port_names=port_names) for reader in self.readers],
+                           key=attrgetter('mono_ns'))
+
+
+def open_capture(file_paths):
+    """ CaptureReader for one file, MergedCapture for more """
+    if len(file_paths) == 1:
+        return CaptureReader(file_paths[0])
+    return MergedCapture(file_paths)
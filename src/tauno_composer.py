@@ -0,0 +1,45 @@
+# File:    tauno_composer.py
+# Author:  Tauno Erik
+# Started: 18.10.2026
+# Edited:  18.10.2026
+# Builds Text View lines in Python before they go to the buffer
+
+class LineComposer():
+    """
+    Collects decorated text (time, arrow, data, line end) into one
+    string. Tags are stored as [tag, start, end] character offsets,
+    so the whole text goes to Gtk.TextBuffer with one insert.
+    """
+
+    def __init__(self):
+        self.parts = []
+        self.segments = []
+        self.length = 0
+
+
+    def add(self, text, tag=None):
+        """ Add text, optionally with a tag """
+        if not text:
+            return
+        start = self.length
+        self.length += len(text)
+        self.parts.append(text)
+
+        if tag is None:
+            return
+        # Continue previous segment if same tag
+        if self.segments:
+            last = self.segments[-1]
+            if last[0] is tag and last[2] == start:
+                last[2] = self.length
+                return
+        self.segments.append([tag, start, self.length])
+
+
+    def get_text(self):
+        """ All collected text as one string """
+        return ''.join(self.parts)
+
+
+    def is_empty(self):
+        return self.length == 0
@@ -0,0 +1,94 @@
+# File:    tauno_config.py
+# Author:  Tauno Erik
+# Started: 18.10.2026
+# Edited:  18.10.2026
+# Read-only snapshot of settings used on every RX line
+
+from dataclasses import dataclass
+
+# Line end names in dropdowns and Text View, by line end index
+TX_LINE_END_NAMES = ['\\n', '\\r', '\\r\\n', 'None']
+RX_LINE_END_NAMES = ['\\n', '\\r', '\\r\\n', ';', 'None']
+# Line end added after every line, by line end index
+LINE_ENDS = ['\n', '\r', '\r\n', ';', '']
+
+@dataclass(frozen=True)
+class DisplayConfig():
+    """
+    Settings used by serial reader and Text View on every line.
+    Never changed; a new snapshot is made when settings change,
+    so one batch of data always uses one set of settings.
+    """
+    rx_format: str = 'ASCII'
+    rx_line_end_index: int = 0
+    tx_line_end_index: int = 0
+    timestamp: bool = True
+    arrow: bool = True
+    show_line_end: bool = False
+    decode_errors: str = 'replace'
+    framing: str = 'line-end'
+    frame_delimiter: str = '\\r\\n'
+    frame_length: int = 16
+    frame_prefix_size: int = 1
+    frame_prefix_byteorder: str = 'big'
+    frame_idle_ms: int = 20
+
+    # gschema keys the snapshot is made from
+    KEYS = ('saved-serial-rx-data-format',
+            'saved-serial-rx-line-end-index',
+            'saved-serial-tx-line-end-index',
+            'timestamp',
+            'arrow',
+            'show-line-end',
+            'rx-decode-errors',
+            'rx-framing',
+            'rx-frame-delimiter',
+            'rx-frame-length',
+            'rx-frame-prefix-size',
+            'rx-frame-prefix-byteorder',
+            'rx-frame-idle-ms')
+
+
+    @classmethod
+    def from_settings(cls, settings):
+        """ Make snapshot from Gio.Settings """
+        return cls(
+            rx_format=settings.get_string("saved-serial-rx-data-format"),
+            rx_line_end_index=settings.get_int("saved-serial-rx-line-end-index"),
+            tx_line_end_index=settings.get_int("saved-serial-tx-line-end-index"),
+            timestamp=settings.get_boolean("timestamp"),
+            arrow=settings.get_boolean("arrow"),
+            show_line_end=settings.get_boolean("show-line-end"),
+            decode_errors=settings.get_string("rx-decode-errors"),
+            framing=settings.get_string("rx-framing"),
+            frame_delimiter=settings.get_string("rx-frame-delimiter"),
+            frame_length=settings.get_int("rx-frame-length"),
+            frame_prefix_size=settings.get_int("rx-frame-prefix-size"),
+            frame_prefix_byteorder=settings.get_string("rx-frame-prefix-byteorder"),
+            frame_idle_ms=settings.get_int("rx-frame-idle-ms"),
+        )
+
+
+    @property
+    def framed(self):
+        """ Frames are cut by rx-framing settings, not by the RX line end """
+        return self.framing != 'line-end'
+
+
+    def framing_key(self):
+        """ Values that change how received data is cut into frames """
+        return (self.rx_format == 'HEX', self.rx_line_end_index, self.framing,
+                self.frame_delimiter, self.frame_length, self.frame_prefix_size,
+                self.frame_prefix_byteorder, self.frame_idle_ms)
+
+
+    def line_end(self, direction):
+        """ (shown, real) line end after a RX or TX line """
+        if direction == 'TX':
+            index = self.tx_line_end_index
+            shown = TX_LINE_END_NAMES[index]
+        else:
+            index = self.rx_line_end_index
+            # 'None' is not shown
+            shown = RX_LINE_END_NAMES[index] if index != 4 else ''
+        return shown, LINE_ENDS[index]
@@ -0,0 +1,31 @@
+# File:    tauno_format.py
+# Author:  Tauno Erik
+# Started: 18.10.2026
+# Edited:  18.10.2026
+# Byte formats: HEX, DEC, OCT, BIN
+# Whole chunk is formatted to one string with one call.
+
+# Formats shown byte by byte
+BYTE_FORMATS = ('HEX', 'DEC', 'OCT', 'BIN')
+
+# Precomputed text for every byte value
+TABLES = {
+    'HEX': [format(i, '02x') + ' ' for i in range(256)],
+    'DEC': [format(i, '03d') + ' ' for i in range(256)],
+    'OCT': [format(i, '03o') + ' ' for i in range(256)],
+    # Pad with leading zeros to show the full byte
+    'BIN': [format(i, '08b') for i in range(256)],
+}
+
+# Characters per byte
+ITEM_WIDTH = {name: len(table[0]) for name, table in TABLES.items()}
+
+
+def format_bytes(data, byte_format):
+    """
+    Format bytes to string, e.g. 'HEX': b'\\x01\\xff' -> '01 ff '
+    """
+    if byte_format == 'HEX':
+        # Done in C
+        return data.hex(' ') + ' ' if data else ''
+    return ''.join(map(TABLES[byte_format].__getitem__, data))
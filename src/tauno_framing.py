@@ -0,0 +1,195 @@
+# File:    tauno_framing.py
+# Author:  Tauno Erik
+# Started: 18.10.2026
+# Edited:  18.10.2026
+# Cuts received bytes into frames.
+# Every framer scans each received byte once (O(n)).
+
+import re
+
+# Framing modes (gschema rx-framing)
+FRAMING_MODES = ['line-end', 'delimiter', 'fixed-length', 'length-prefix', 'idle-gap']
+
+# Framers that collect data without an end (idle-gap, broken
+# length prefix) give out a frame when it gets this big
+MAX_FRAME_SIZE = 65536
+
+
+# Escapes in delimiter settings string
+DELIMITER_ESCAPES = {'\\': b'\\', 'n': b'\n', 'r': b'\r', 't': b'\t', '0': b'\0',
+                     'a': b'\a', 'b': b'\b', 'f': b'\f', 'v': b'\v'}
+DELIMITER_ESCAPE_PATTERN = re.compile(r'\\(x[0-9a-fA-F]{2}|[\\nrt0abfv])')
+
+
+def parse_delimiter(text):
+    """
+    Delimiter from settings string with escapes, e.g. '\\r\\n' or '\\x02\\x03'.
+    Other characters are UTF-8, unknown escapes are kept as they are.
+    """
+    parts = []
+    position = 0
+    for match in DELIMITER_ESCAPE_PATTERN.finditer(text):
+        parts.append(text[position:match.start()].encode('utf-8'))
+        escape = match.group(1)
+        if escape[0] == 'x':
+            parts.append(bytes((int(escape[1:], 16),)))
+        else:
+            parts.append(DELIMITER_ESCAPES[escape])
+        position = match.end()
+    parts.append(text[position:].encode('utf-8'))
+    return b''.join(parts)
+
+
+class RawFramer():
+    """ No framing, every read is one frame """
+
+    # Seconds between poll() calls, None = not needed
+    poll_interval = None
+
+    def feed(self, chunk, now_ns):
+        """ Add received bytes, returns list of complete frames """
+        return [bytes(chunk)]
+
+    def poll(self, now_ns):
+        """ Called when no data was received, returns list of frames """
+        return []
+
+    def flush(self):
+        """ Take bytes still waiting for the rest of a frame """
+        return b''
+
+
+class BufferedFramer(RawFramer):
+    """ Base for framers that keep an incomplete frame """
+
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def flush(self):
+        data = bytes(self.buffer)
+        self.buffer.clear()
+        return data
+
+
+class DelimiterFramer(BufferedFramer):
+    """ Frame ends with delimiter (one or more bytes), delimiter is kept """
+
+    def __init__(self, delimiter):
+        if not delimiter:
+            raise ValueError("Empty delimiter")
+        super().__init__()
+        self.delimiter = bytes(delimiter)
+        # Bytes before this are already searched
+        self.scan_from = 0
+
+    def feed(self, chunk, now_ns):
+        buffer = self.buffer
+        buffer += chunk
+        delimiter = self.delimiter
+        size = len(delimiter)
+        frames = []
+        start = 0
+        index = buffer.find(delimiter, self.scan_from)
+        if index >= 0:
+            with memoryview(buffer) as view:
+                while index >= 0:
+                    stop = index + size
+                    frames.append(bytes(view[start:stop]))
+                    start = stop
+                    index = buffer.find(delimiter, start)
+            del buffer[:start]
+        # Delimiter may start in the last size-1 bytes
+        self.scan_from = max(0, len(buffer) - size + 1)
+        return frames
+
+    def flush(self):
+        self.scan_from = 0
+        return super().flush()
+
+
+class FixedLengthFramer(BufferedFramer):
+    """ Every frame is length bytes """
+
+    def __init__(self, length):
+        if length < 1:
+            raise ValueError("Frame length must be > 0")
+        super().__init__()
+        self.length = length
+
+    def feed(self, chunk, now_ns):
+        buffer = self.buffer
+        buffer += chunk
+        length = self.length
+        usable = len(buffer) - len(buffer) % length
+        if not usable:
+            return []
+        with memoryview(buffer) as view:
+            frames = [bytes(view[i:i + length]) for i in range(0, usable, length)]
+        del buffer[:usable]
+        return frames
+
+
+class LengthPrefixFramer(BufferedFramer):
+    """
+    Frame starts with its payload length: prefix_size bytes (1, 2 or 4)
+    in byteorder 'big' or 'little'. Frame includes the prefix.
+    """
+
+    def __init__(self, prefix_size, byteorder='big'):
+        if prefix_size not in (1, 2, 4):
+            raise ValueError("Prefix size must be 1, 2 or 4")
+        super().__init__()
+        self.prefix_size = prefix_size
+        self.byteorder = byteorder
+
+    def feed(self, chunk, now_ns):
+        buffer = self.buffer
+        buffer += chunk
+        prefix_size = self.prefix_size
+        size = len(buffer)
+        frames = []
+        start = 0
+        with memoryview(buffer) as view:
+            while size - start >= prefix_size:
+                payload = int.from_bytes(view[start:start + prefix_size], self.byteorder)
+                stop = start + prefix_size + payload
+                if stop > size:
+                    break
+                frames.append(bytes(view[start:stop]))
+                start = stop
+        del buffer[:start]
+        # Prefix is probably broken, do not wait forever
+        if len(buffer) > MAX_FRAME_SIZE:
+            frames.append(bytes(buffer))
+            buffer.clear()
+        return frames
+
+
+class IdleGapFramer(BufferedFramer):
+    """ Frame ends when no data is received for gap_ms milliseconds """
+
+    def __init__(self, gap_ms):
+        if gap_ms < 1:
+            raise ValueError("Idle gap must be > 0 ms")
+        super().__init__()
+        self.gap_ns = gap_ms * 1000000
+        # Check twice per gap
+        self.poll_interval = gap_ms / 2000
+        self.last_ns = 0
+
+    def feed(self, chunk, now_ns):
+        frames = []
+        # Gap before this chunk ends the waiting frame,
+        # also when poll() was not called in time
+        if self.buffer and now_ns - self.last_ns >= self.gap_ns:
+            frames.append(self.flush())
+        self.buffer += chunk
+        self.last_ns = now_ns
+        if len(self.buffer) >= MAX_FRAME_SIZE:
+            frames.append(self.flush())
+        return frames
+
+    def poll(self, now_ns):
+        if self.buffer and now_ns - self.last_ns >= self.gap_ns:
+            return [self.flush()]
+        return []
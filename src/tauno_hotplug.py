@@ -0,0 +1,121 @@
+# File:    tauno_hotplug.py
+# Author:  Tauno Erik
+# Started: 18.10.2026
+# Edited:  18.10.2026
+# Serial port hotplug monitor (Linux).
+# Listens to kernel uevents on a netlink socket, the same events
+# udev gets, so a new tty is known as soon as the kernel adds it.
+# Only the added device is looked up, ports are not scanned again.
+
+import errno
+import os
+import socket
+import threading
+from .tauno_trace import get_tracer
+
+trace = get_tracer('serial')
+
+# linux/netlink.h
+NETLINK_KOBJECT_UEVENT = 15
+# Kernel uevent multicast group (udev's own messages are group 2)
+KERNEL_GROUP = 1
+RECEIVE_SIZE = 16 * 1024
+# How often (s) the thread checks stop()
+STOP_POLL = 0.5
+
+ADD = 'add'
+REMOVE = 'remove'
+# Events were lost, scan all ports
+RESCAN = 'rescan'
+
+
+def parse_uevent(data):
+    """
+    Kernel uevent: b'add@/devices/...\\0ACTION=add\\0SUBSYSTEM=tty\\0...'
+    Returns (action, device path) for tty devices, else None.
+    """
+    properties = {}
+    for field in data.split(b'\0')[1:]:
+        key, equal, value = field.partition(b'=')
+        if equal:
+            properties[key] = value
+    if properties.get(b'SUBSYSTEM') != b'tty':
+        return None
+    action = properties.get(b'ACTION', b'').decode('ascii', 'replace')
+    name = properties.get(b'DEVNAME')
+    if action not in (ADD, REMOVE) or not name:
+        return None
+    return action, os.path.join('/dev', name.decode('utf-8', 'replace'))
+
+
+def port_info(device):
+    """ pyserial ListPortInfo of one device, None if it has no USB VID """
+    try:
+        from serial.tools.list_ports_linux import SysFS
+        info = SysFS(device)
+    except (ImportError, OSError) as e:
+        trace.debug("Port info %s: %s", device, e)
+        return None
+    return info if info.vid is not None else None
+
+
+class PortMonitor():
+    """
+    Calls on_event(action, device) in monitor thread when a tty
+    is added or removed. action: ADD or REMOVE, device: '/dev/ttyUSB0'
+    or RESCAN, None when events were lost.
+    start() returns False if uevents are not available
+    (not Linux, or blocked by a sandbox).
+    """
+
+    def __init__(self, on_event):
+        self.on_event = on_event
+        self.stop_event = threading.Event()
+        self.sock = None
+        self.thread = None
+
+
+    def start(self):
+        try:
+            self.sock = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM,
+                                      NETLINK_KOBJECT_UEVENT)
+            self.sock.bind((0, KERNEL_GROUP))
+            self.sock.settimeout(STOP_POLL)
+        except (AttributeError, OSError) as e:
+            trace.info("Port hotplug not available: %s", e)
+            if self.sock is not None:
+                self.sock.close()
+                self.sock = None
+            return False
+        self.thread = threading.Thread(target=self.run)
+        self.thread.daemon = True
+        self.thread.start()
+        return True
+
+
+    def stop(self):
+        self.stop_event.set()
+
+
+    def run(self):
+        """ Monitor thread """
+        sock = self.sock
+        try:
+            while not self.stop_event.is_set():
+                try:
+                    data = sock.recv(RECEIVE_SIZE)
+                except socket.timeout:
+                    continue
+                except OSError as e:
+                    if e.errno != errno.ENOBUFS:
+                        trace.error("Port hotplug: %s", e)
+                        return
+                    # Receive buffer was full
+                    self.on_event(RESCAN, None)
+                    continue
+                event = parse_uevent(data)
+                if event is not None:
+                    trace.debug("Port %s: %s", *event)
+                    self.on_event(*event)
+        finally:
+            sock.close()
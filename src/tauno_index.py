@@ -0,0 +1,270 @@
+# File:    tauno_index.py
+# Author:  Tauno Erik
+# Started: 18.10.2026
+# Edited:  18.10.2026
+# Sparse sidecar index for logs and captures (<log>.idx).
+# Every N lines or records the index gets one entry:
+# (time ns, line or record number, byte offset), so a place in
+# a multi-GB file is found with bisect instead of reading the file.
+#
+# File layout (little endian):
+#   Header:  magic b'TMIDX\0', version u16, kind u8, interval u32
+#   Entries: time ns i64, number u64, offset u64
+# Text logs: time is time.time_ns() when the line was received,
+#            number is lines before offset.
+# Captures:  time is record monotonic ns (see CaptureReader.wall_time),
+#            number is records before offset.
+
+import mmap
+import os
+import struct
+from bisect import bisect_right
+from .tauno_capture import HEADER as CAPTURE_HEADER, RECORD as CAPTURE_RECORD
+from .tauno_trace import get_tracer
+
+trace = get_tracer('log')
+
+INDEX_SUFFIX = '.idx'
+INDEX_MAGIC = b'TMIDX\0'
+INDEX_VERSION = 1
+
+INDEX_HEADER = struct.Struct('<6sHBxI')
+INDEX_ENTRY = struct.Struct('<qQQ')
+
+# Index kinds
+KIND_TEXT = 0
+KIND_CAPTURE = 1
+
+
+class LogIndexError(Exception):
+    """ File is not an index file """
+
+
+def index_path(log_path):
+    """ Sidecar index path for log or capture file """
+    return log_path + INDEX_SUFFIX
+
+
+class TextIndexer():
+    """
+    Used by LogWriter (tauno_logging.py) in its writer thread.
+    Entry points to the start of a line.
+    """
+
+    kind = KIND_TEXT
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.file_handle = None
+        self.count = 0
+        self.last_indexed = 0
+
+
+    def open(self, log_path):
+        """ Start index for a new log file or segment """
+        self.close()
+        self.count = 0
+        self.last_indexed = self.start_count()
+        try:
+            self.file_handle = open(index_path(log_path), 'wb')
+            self.file_handle.write(INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION,
+                                                     self.kind, self.interval))
+        except (OSError, IOError) as e:
+            trace.error("Error creating index: %s", e)
+            self.file_handle = None
+
+
+    def start_count(self):
+        return 0
+
+
+    def add_entry(self, time_ns, number, offset):
+        if self.file_handle is not None:
+            self.file_handle.write(INDEX_ENTRY.pack(time_ns, number, offset))
+
+
+    def add(self, data, offset, times):
+        """
+        data: bytes just written to log at offset
+        times: (end offset in data, time ns) of every written item
+        """
+        lines = data.count(b'\n')
+        if not lines:
+            return
+        count = self.count
+        end_count = count + lines
+        target = self.last_indexed + self.interval
+        if target <= end_count:
+            position = 0
+            item = 0
+            last_item = len(times) - 1
+            find = data.find
+            while target <= end_count:
+                # Skip to the start of line number target
+                for _ in range(target - count):
+                    position = find(b'\n', position) + 1
+                count = target
+                # Time of the item the line starts in
+                while item < last_item and times[item][0] <= position:
+                    item += 1
+                self.add_entry(times[item][1], count, offset + position)
+                self.last_indexed = count
+                target += self.interval
+        self.count = end_count
+
+
+    def flush(self):
+        if self.file_handle is not None:
+            self.file_handle.flush()
+
+
+    def close(self):
+        if self.file_handle is not None:
+            try:
+                self.file_handle.close()
+            except (OSError, IOError) as e:
+                trace.error("Error closing index: %s", e)
+            self.file_handle = None
+
+
+class CaptureIndexer(TextIndexer):
+    """
+    Index for capture files (tauno_capture.py).
+    Entry points to the start of a record.
+    """
+
+    kind = KIND_CAPTURE
+
+    def start_count(self):
+        # First record always gets an entry
+        return -self.interval
+
+
+    def add(self, data, offset, times):
+        """
+        data: whole records (and header at file start) written at offset
+        times: not used, records have their own time
+        """
+        unpack_from = CAPTURE_RECORD.unpack_from
+        record_size = CAPTURE_RECORD.size
+        position = CAPTURE_HEADER.size if offset == 0 else 0
+        size = len(data)
+        count = self.count
+        while position + record_size <= size:
+            length, mono_ns, code, port_id, checksum = unpack_from(data, position)
+            if count - self.last_indexed >= self.interval:
+                self.add_entry(mono_ns, count, offset + position)
+                self.last_indexed = count
+            count += 1
+            position += record_size + length
+        self.count = count
+
+
+class LogIndex():
+    """
+    Reads sidecar index and finds byte offsets with bisect.
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as file_handle:
+            data = file_handle.read()
+        if len(data) < INDEX_HEADER.size:
+            raise LogIndexError("Index header is missing")
+        magic, version, self.kind, self.interval = INDEX_HEADER.unpack_from(data, 0)
+        if magic != INDEX_MAGIC or version != INDEX_VERSION:
+            raise LogIndexError("Not an index file")
+
+        # Last entry may be cut short by a crash
+        end = INDEX_HEADER.size + (len(data) - INDEX_HEADER.size) // INDEX_ENTRY.size * INDEX_ENTRY.size
+        entries = list(INDEX_ENTRY.iter_unpack(data[INDEX_HEADER.size:end]))
+        self.times = [entry[0] for entry in entries]
+        self.numbers = [entry[1] for entry in entries]
+        self.offsets = [entry[2] for entry in entries]
+        self.start_offset = CAPTURE_HEADER.size if self.kind == KIND_CAPTURE else 0
+
+
+    @classmethod
+    def for_log(cls, log_path):
+        """ Index of log or capture file, None if there is no index """
+        path = index_path(log_path)
+        if not os.path.exists(path):
+            return None
+        try:
+            return cls(path)
+        except (OSError, LogIndexError) as e:
+            trace.error("Error reading index: %s", e)
+            return None
+
+
+    def __len__(self):
+        return len(self.offsets)
+
+
+    def find_time(self, time_ns):
+        """
+        (offset, number) of the last entry at or before time_ns.
+        Data for time_ns is at this offset or after it.
+        """
+        i = bisect_right(self.times, time_ns) - 1
+        if i < 0:
+            return self.start_offset, 0
+        return self.offsets[i], self.numbers[i]
+
+
+    def find_number(self, number):
+        """ (offset, number) of the last entry at or before line/record number """
+        i = bisect_right(self.numbers, number) - 1
+        if i < 0:
+            return self.start_offset, 0
+        return self.offsets[i], self.numbers[i]
+
+
+def line_offset(log_path, line, index=None):
+    """
+    Byte offset of line number (0 = first line) in a text log.
+    Uses index to skip to the nearest entry, None if there is no such line.
+    """
+    if index is None:
+        index = LogIndex.for_log(log_path)
+    offset, number = (0, 0) if index is None else index.find_number(line)
+    with open(log_path, 'rb') as file_handle:
+        if os.fstat(file_handle.fileno()).st_size == 0:
+            return None
+        with mmap.mmap(file_handle.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            while number < line:
+                offset = data.find(b'\n', offset) + 1
+                if offset == 0:
+                    return None
+                number += 1
+            return offset if offset < len(data) else None
+
+
+def capture_offset(reader, mono_ns, index=None):
+    """
+    Offset of the first record at or after mono_ns in a capture
+    (CaptureReader), None if there is no such record.
+    """
+    if index is None:
+        index = LogIndex.for_log(reader.file_path)
+    offset = CAPTURE_HEADER.size if index is None else index.find_time(mono_ns)[0]
+    for record in reader.records(offset, port_names=True):
+        if record.mono_ns >= mono_ns:
+            return record.offset
+    return None
+
+
+def trim_index(log_path, size):
+    """
+    Remove entries at or after byte offset size, for a log
+    truncated by recovery (tauno_recovery.py)
+    """
+    path = index_path(log_path)
+    try:
+        index = LogIndex(path)
+    except (OSError, LogIndexError):
+        return
+    keep = bisect_right(index.offsets, size - 1)
+    if keep == len(index):
+        return
+    with open(path, 'r+b') as file_handle:
+        file_handle.truncate(INDEX_HEADER.size + keep * INDEX_ENTRY.size)
@@ -1,38 +1,483 @@
 # File:    tauno_logging.py
 # Author:  Tauno Erik
 # Started: 29.07.2024
-# Edited:  11.02.2026
+# Edited:  18.10.2026
 
 from datetime import datetime
 import os
+import re
 import atexit
+import threading
+import time
+from itertools import accumulate
+from .tauno_format import ITEM_WIDTH, BYTE_FORMATS, format_bytes
+from .tauno_capture import CaptureEncoder, make_header
+from .tauno_structured import STRUCTURED_FORMATS
+from .tauno_index import TextIndexer, CaptureIndexer
+from .tauno_rotation import (RotationConfig, SegmentWorker, COMPRESSION_SUFFIXES,
+                             segment_path, compress_file, delete_segment)
+from .tauno_recovery import mark_open, mark_closed
+from .tauno_trace import get_tracer
+
+trace = get_tracer('log')
+
+# Log formats (gschema log-format)
+LOG_FORMATS = ['text', 'capture', 'both', 'jsonl', 'csv']
+# Capture streams (gschema log-split)
+LOG_SPLITS = ['none', 'direction', 'port']
+# Characters not used in stream file names
+STREAM_NAME_PATTERN = re.compile(r'[^A-Za-z0-9_-]+')
+
+# Items per line in HEX, DEC and OCT logs
+HEX_ITEMS_PER_LINE = 16
+
+# Wake the writer thread early when this much text is waiting (characters)
+WRITE_BATCH_SIZE = 256 * 1024
+# Seconds to wait for the writer thread on exit
+EXIT_TIMEOUT = 5
+
+
+class LogWriter():
+    """
+    Writes log text to a file in its own thread.
+    write() only adds text to a list, so a slow disk never
+    stops the Text View or the serial reader.
+    The thread joins waiting text into one write and flushes
+    (and fsyncs, if asked) every flush_interval seconds.
+    rotation: RotationConfig (tauno_rotation.py), None = one file
+    sync_interval: fsync at least every sync_interval seconds, 0 = off.
+        Data before the last sync is kept after a power loss.
+    binary: write bytes instead of text
+    worker: SegmentWorker that compresses and deletes old segments
+    segment_header: function that returns text for the start of a new segment
+    indexer: sidecar index writer (tauno_index.py), None = no index
+    Open files have a marker file, so a file left open by a crash
+    is repaired on next start (tauno_recovery.py).
+    """
+
+    def __init__(self, file_path, flush_interval=1.0, fsync=False, rotation=None,
+                 sync_interval=0, binary=False, worker=None, segment_header=None,
+                 indexer=None):
+        self.file_path = file_path
+        self.first_path = file_path
+        self.binary = binary
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.rotation = rotation
+        self.sync_interval = sync_interval
+        self.worker = worker
+        self.segment_header = segment_header
+        self.indexer = indexer
+        # Paths of closed segments, oldest first
+        self.segments = []
+        self.segment_number = 0
+        self.pending = []
+        # time.time_ns() of every pending item, for the index
+        self.pending_times = []
+        self.pending_size = 0
+        self.condition = threading.Condition()
+        self.closing = False
+        self.thread = threading.Thread(target=self.run)
+        self.thread.daemon = True
+        self.thread.start()
+
+
+    def configure(self, flush_interval, fsync, rotation=None, sync_interval=0):
+        """ Change flush interval (seconds), fsync, rotation and sync interval """
+        with self.condition:
+            self.flush_interval = flush_interval
+            self.fsync = fsync
+            self.rotation = rotation
+            self.sync_interval = sync_interval
+            self.condition.notify()
+
+
+    def write(self, text, wall_time=None):
+        """
+        Add text to write queue.
+        wall_time: time.time() of the data in text, None = now
+        """
+        if not text:
+            return
+        time_ns = time.time_ns() if wall_time is None else int(wall_time * 1e9)
+        with self.condition:
+            self.pending.append(text)
+            self.pending_times.append(time_ns)
+            self.pending_size += len(text)
+            if self.pending_size >= WRITE_BATCH_SIZE:
+                self.condition.notify()
+
+
+    def close(self, wait=False):
+        """ Write what is waiting, then close the file and stop the thread """
+        with self.condition:
+            self.closing = True
+            self.condition.notify()
+        if wait:
+            self.thread.join(EXIT_TIMEOUT)
+
+
+    def next_segment(self, rotation):
+        """
+        Called in writer thread after current segment is closed.
+        Old segments go to worker for compression and deletion.
+        """
+        closed = self.file_path
+        self.segments.append(closed)
+        self.segment_number += 1
+        self.file_path = segment_path(self.first_path, self.segment_number, rotation.naming)
+
+        if self.worker is None:
+            return
+        if rotation.compression in COMPRESSION_SUFFIXES:
+            self.worker.add(compress_file, closed, rotation.compression)
+        # Current segment counts too
+        if rotation.keep > 0:
+            while len(self.segments) > rotation.keep - 1:
+                self.worker.add(delete_segment, self.segments.pop(0))
+
+
+    def run(self):
+        """ Writer thread """
+        # Text is encoded here, so index offsets are byte offsets
+        empty = b'' if self.binary else ''
+        indexer = self.indexer
+        file_handle = None
+        last_flush = time.monotonic()
+        last_sync = last_flush
+        segment_start = last_flush
+        segment_size = os.path.getsize(self.file_path) if os.path.exists(self.file_path) else 0
+        new_segment = False
+        if indexer is not None:
+            indexer.open(self.file_path)
+        while True:
+            with self.condition:
+                if not self.closing and self.pending_size < WRITE_BATCH_SIZE:
+                    self.condition.wait(self.flush_interval)
+                batch = self.pending
+                times = self.pending_times
+                self.pending = []
+                self.pending_times = []
+                self.pending_size = 0
+                closing = self.closing
+                flush_interval = self.flush_interval
+                fsync = self.fsync
+                rotation = self.rotation
+                sync_interval = self.sync_interval
+
+            try:
+                now = time.monotonic()
+                # Rotate between batches, so no data is cut
+                if (rotation is not None and segment_size > 0 and not closing and
+                        ((rotation.max_seconds and now - segment_start >= rotation.max_seconds) or
+                         (rotation.max_bytes and batch and
+                          segment_size + sum(map(len, batch)) > rotation.max_bytes))):
+                    if file_handle is not None:
+                        self.close_segment(file_handle)
+                        file_handle = None
+                    self.next_segment(rotation)
+                    if indexer is not None:
+                        indexer.open(self.file_path)
+                    segment_start = now
+                    segment_size = 0
+                    new_segment = True
+
+                if batch:
+                    if file_handle is None:
+                        mark_open(self.file_path)
+                        file_handle = open(self.file_path, 'ab')
+                        if new_segment and self.segment_header is not None:
+                            batch.insert(0, self.segment_header())
+                            times.insert(0, times[0])
+                        new_segment = False
+                    if indexer is None:
+                        data = empty.join(batch)
+                        if not self.binary:
+                            data = data.encode('utf-8')
+                        file_handle.write(data)
+                    else:
+                        if not self.binary:
+                            batch = [text.encode('utf-8') for text in batch]
+                        data = b''.join(batch)
+                        file_handle.write(data)
+                        # (end offset in data, time ns) of every item
+                        indexer.add(data, segment_size,
+                                    list(zip(accumulate(map(len, batch)), times)))
+                    segment_size += len(data)
+
+                if file_handle is not None and (closing or now - last_flush >= flush_interval):
+                    file_handle.flush()
+                    # Durable sync point
+                    if fsync or (sync_interval and now - last_sync >= sync_interval):
+                        os.fsync(file_handle.fileno())
+                        last_sync = now
+                    # Index only after the data it points to
+                    if indexer is not None:
+                        indexer.flush()
+                    last_flush = now
+            except (OSError, IOError) as e:
+                trace.error("Error writing data: %s", e)
+                # Try to open again with the next batch
+                if file_handle is not None:
+                    try:
+                        file_handle.close()
+                    except (OSError, IOError):
+                        pass
+                    file_handle = None
+
+            if closing:
+                if indexer is not None:
+                    indexer.close()
+                if file_handle is not None:
+                    try:
+                        self.close_segment(file_handle)
+                    except (OSError, IOError) as e:
+                        trace.error("Error closing log file: %s", e)
+                return
+
+
+    def close_segment(self, file_handle):
+        """ Everything is on disk before the marker is removed """
+        file_handle.flush()
+        os.fsync(file_handle.fileno())
+        file_handle.close()
+        mark_closed(self.file_path)
+
+
+class TextLogEncoder():
+    """
+    Text log from session frames: the same text Text View shows.
+    Runs in the serial reader thread (RX) and GTK thread (TX).
+    config: DisplayConfig (tauno_config.py), replaced when settings change
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.lock = threading.Lock()
+        # Items on the current HEX, DEC or OCT stream line
+        self.hex_counter = 0
+
+
+    def encode(self, frames):
+        # Same settings for the whole batch
+        config = self.config
+        parts = []
+        with self.lock:
+            for frame in frames:
+                self.encode_frame(parts, frame, config)
+        return ''.join(parts)
+
+
+    def encode_frame(self, parts, frame, config):
+        rx_format = config.rx_format
+        if frame.direction == 'RX':
+            # HEX, DEC or OCT stream
+            if rx_format in ('HEX', 'DEC', 'OCT') and not config.framed:
+                self.add_hex_stream(parts, format_bytes(frame.data, rx_format),
+                                    ITEM_WIDTH[rx_format])
+                return
+            if rx_format in BYTE_FORMATS:
+                text = format_bytes(frame.data, rx_format)
+            else:
+                text = frame.text
+                if text is None:
+                    text = frame.data.decode('utf-8', errors=config.decode_errors)
+                text = text.strip()
+        else:
+            text = frame.data.decode('utf-8', errors='replace')
+
+        # Stream line ends before a new line
+        if self.hex_counter:
+            parts.append('\n')
+            self.hex_counter = 0
+        if config.timestamp:
+            parts.append(datetime.fromtimestamp(frame.wall_time).strftime("%H:%M:%S.%f "))
+        if config.arrow:
+            parts.append('<-- ' if frame.direction == 'TX' else '--> ')
+        parts.append(text)
+        if frame.direction == 'RX' and config.framed:
+            # Frame is not ended by a line end
+            parts.append('\n')
+            return
+        shown, real = config.line_end(frame.direction)
+        if config.show_line_end:
+            parts.append(shown)
+        parts.append(real)
+
+
+    def add_hex_stream(self, parts, text, width):
+        """
+        HEX, DEC or OCT data in a nice format, 16 items per line.
+        text: items of the same width (with space after)
+        """
+        start = 0
+        size = len(text)
+        take = (HEX_ITEMS_PER_LINE - self.hex_counter) * width
+        while size - start >= take:
+            parts.append(text[start:start + take])
+            parts.append('\n')
+            start += take
+            take = HEX_ITEMS_PER_LINE * width
+        parts.append(text[start:])
+        self.hex_counter = (self.hex_counter + size // width) % HEX_ITEMS_PER_LINE
+
+
+class Recorder():
+    """ Capture or structured log: frames are encoded and written by writer """
+
+    def __init__(self, writer, encode):
+        self.writer = writer
+        self.encode = encode
+
+
+    def write_frames(self, frames):
+        self.writer.write(self.encode(frames), frames[0].wall_time)
+
+
+    def writers(self):
+        return [self.writer]
+
+
+    def close(self):
+        """ Returns writers to close """
+        return [self.writer]
+
+
+class StreamSplitter():
+    """
+    Writes every direction (RX, TX) or port to its own file, e.g.
+    name.rx.tmcap and name.tx.tmcap. A file is made on the first frame
+    of its stream with make_recorder(path), which returns Recorder or None.
+    All streams of one log use the same monotonic clock, so they can
+    be put back in order with MergedCapture (tauno_capture.py).
+    """
+
+    def __init__(self, file_path, split, make_recorder):
+        self.root, self.extension = os.path.splitext(file_path)
+        self.split = split
+        self.make_recorder = make_recorder
+        # Stream name: Recorder
+        self.streams = {}
+        self.lock = threading.Lock()
+        self.closed = False
+
+
+    def stream_name(self, frame):
+        if self.split == 'direction':
+            return frame.direction.lower()
+        name = os.path.basename(str(frame.port))
+        return STREAM_NAME_PATTERN.sub('_', name) or 'port'
+
+
+    def write_frames(self, frames):
+        groups = {}
+        stream_name = self.stream_name
+        for frame in frames:
+            groups.setdefault(stream_name(frame), []).append(frame)
+        for name, group in groups.items():
+            recorder = self.streams.get(name)
+            if recorder is None:
+                recorder = self.open_stream(name)
+                if recorder is None:
+                    continue
+            recorder.write_frames(group)
+
+
+    def open_stream(self, name):
+        """ Called from RX reader and GTK (TX) threads """
+        with self.lock:
+            if self.closed:
+                return None
+            if name not in self.streams:
+                path = f"{self.root}.{name}{self.extension}"
+                self.streams[name] = self.make_recorder(path)
+            return self.streams[name]
+
+
+    def writers(self):
+        with self.lock:
+            return [recorder.writer for recorder in self.streams.values()
+                    if recorder is not None]
+
+
+    def close(self):
+        """ No new streams after this. Returns writers to close. """
+        with self.lock:
+            self.closed = True
+        return self.writers()
+
 
 class TaunoLogging():
 
     def __init__(self, window_reference):
         self.window_reference = window_reference
         self.log_file_path = ''
-        self.file_handle = None
-        self.hex_counter = 0
+        self.writer = None
+        # Text log is fed with frames by the serial session
+        self.text_encoder = None
+        self.text_session = None
+        # Capture and structured logs: Recorder or StreamSplitter,
+        # fed with frames by the serial session
+        self.recorders = []
+        self.recorder_session = None
+        # Closed writers that may still be writing
+        self.closed_writers = []
+        # Compresses and deletes rotated segments
+        self.segment_worker = SegmentWorker()
         self.data = ''
+        settings = self.window_reference.settings
+        # Read in GTK thread, stream files are made in the RX reader thread
+        self.writer_config = self.writer_settings()
+        self.index_interval = settings.get_int("log-index-interval")
+        for key in ("log-flush-interval", "log-fsync", "log-sync-interval",
+                    "log-rotate-size", "log-rotate-interval", "log-rotate-naming",
+                    "log-compression", "log-keep-segments", "log-index-interval"):
+            settings.connect("changed::" + key, self.on_writer_settings_changed)
         atexit.register(self.cleanup)
 
 
     def cleanup(self):
-        """Ensure file is closed on exit"""
-        if self.file_handle is not None:
-            try:
-                self.file_handle.close()
-            except:
-                pass
-            self.file_handle = None
+        """Ensure everything is written and file is closed on exit"""
+        self.close_recorders()
+        self.close_text_session()
+        if self.writer is not None:
+            self.writer.close()
+            self.closed_writers.append(self.writer)
+            self.writer = None
+        for writer in self.closed_writers:
+            writer.close(wait=True)
+        self.closed_writers = []
+        self.segment_worker.stop(EXIT_TIMEOUT)
 
 
-    def create_file(self, file_path):
-        """ Creates log file. Returns True if successful. """
-        print("log:create_file()")
-        self.log_file_path = file_path
+    def writer_settings(self):
+        """ Flush interval (seconds), fsync, rotation and sync interval from settings """
+        settings = self.window_reference.settings
+        rotation = RotationConfig.from_settings(settings)
+        return (settings.get_int("log-flush-interval") / 1000,
+                settings.get_boolean("log-fsync"),
+                rotation if rotation.enabled else None,
+                settings.get_int("log-sync-interval"))
 
+
+    def on_writer_settings_changed(self, settings, key):
+        self.writer_config = self.writer_settings()
+        self.index_interval = settings.get_int("log-index-interval")
+        writers = [writer for recorder in self.recorders for writer in recorder.writers()]
+        if self.writer is not None:
+            writers.append(self.writer)
+        for writer in writers:
+            writer.configure(*self.writer_config)
+
+
+    def make_indexer(self, indexer_class):
+        """ Sidecar index every log-index-interval lines or records, 0 = off """
+        interval = self.index_interval
+        return indexer_class(interval) if interval > 0 else None
+
+
+    def check_path(self, file_path):
+        """ Returns real path. Raises ValueError if path is not allowed. """
         allowed_dir = os.path.expanduser("~")
         real_path = os.path.realpath(file_path)
 
@@ -44,68 +489,198 @@ class TaunoLogging():
         if ".." in filename or "/" in filename:
             raise ValueError("Invalid filename")
 
-        self.log_file_path = real_path
+        return real_path
+
+
+    def create_file(self, file_path, session, config):
+        """
+        Creates text log file and writes every frame of
+        session (tauno_session.py) as Text View shows it.
+        config: DisplayConfig. Returns True if successful.
+        """
+        trace.debug("log:create_file()")
+        self.log_file_path = self.check_path(file_path)
 
         try:
-            open(self.log_file_path, "x")
-            print(f"logfile:{self.log_file_path}")
-            return True
+            open(self.log_file_path, "x").close()
+            trace.info("logfile:%s", self.log_file_path)
         except Exception as e:
-            print(f"Error creating file: {e}")
+            trace.error("Error creating file: %s", e)
+            self.log_file_path = ''
             return False
 
+        self.open_writer()
+        self.text_encoder = TextLogEncoder(config)
+        self.text_session = session
+        session.subscribe(self.on_text_frames)
+        return True
+
+
+    def on_text_frames(self, frames):
+        """ Session subscriber: runs in serial reader thread """
+        writer = self.writer
+        if writer is not None:
+            writer.write(self.text_encoder.encode(frames), frames[0].wall_time)
+
+
+    def set_display_config(self, config):
+        """ Text log uses new display settings """
+        if self.text_encoder is not None:
+            self.text_encoder.config = config
+
+
+    def close_text_session(self):
+        """ Stop writing session frames to text log """
+        if self.text_session is not None:
+            self.text_session.unsubscribe(self.on_text_frames)
+            self.text_session = None
+
+
+    def create_capture(self, file_path, session, split='none'):
+        """
+        Creates binary capture file and records every frame of
+        session (tauno_session.py). Returns True if successful.
+        split: 'none', 'direction' or 'port' (LOG_SPLITS)
+        """
+        trace.debug("log:create_capture()")
+        real_path = self.check_path(file_path)
+        # Streams of one capture share the time base
+        start = (time.time_ns(), time.monotonic_ns())
+        return self.start_recording(real_path, split, session,
+                                    lambda path: self.capture_recorder(path, start))
+
+
+    def capture_recorder(self, real_path, start):
+        """ New capture file. Returns Recorder or None. """
+        try:
+            with open(real_path, "xb") as file_handle:
+                file_handle.write(make_header(*start))
+        except Exception as e:
+            trace.error("Error creating file: %s", e)
+            return None
+
+        trace.info("capture:%s", real_path)
+        encoder = CaptureEncoder()
+        # Every capture segment can be read alone
+        writer = LogWriter(real_path, *self.writer_config, binary=True,
+                           worker=self.segment_worker,
+                           segment_header=lambda: make_header() + encoder.port_records(),
+                           indexer=self.make_indexer(CaptureIndexer))
+        return Recorder(writer, encoder.encode)
+
+
+    def create_structured(self, file_path, session, log_format):
+        """
+        Creates JSON Lines or CSV log (tauno_structured.py) with
+        one record per frame of session. Returns True if successful.
+        Always one file: only captures can be split and merged back
+        (MergedCapture in tauno_capture.py).
+        """
+        trace.debug("log:create_structured()")
+        real_path = self.check_path(file_path)
+        return self.start_recording(real_path, 'none', session,
+                                    lambda path: self.structured_recorder(path, log_format))
+
+
+    def structured_recorder(self, real_path, log_format):
+        """ New JSON Lines or CSV file. Returns Recorder or None. """
+        try:
+            open(real_path, "x").close()
+        except Exception as e:
+            trace.error("Error creating file: %s", e)
+            return None
+
+        trace.info("structured:%s", real_path)
+        encoder = STRUCTURED_FORMATS[log_format]()
+        writer = LogWriter(real_path, *self.writer_config,
+                           worker=self.segment_worker,
+                           segment_header=encoder.header,
+                           indexer=self.make_indexer(TextIndexer))
+        writer.write(encoder.header())
+        return Recorder(writer, encoder.encode)
+
+
+    def start_recording(self, real_path, split, session, make_recorder):
+        """
+        One file, or a StreamSplitter that makes a file per stream.
+        Returns True if successful.
+        """
+        if split in ('direction', 'port'):
+            recorder = StreamSplitter(real_path, split, make_recorder)
+        else:
+            recorder = make_recorder(real_path)
+            if recorder is None:
+                return False
+        self.add_recorder(recorder, session)
+        return True
+
+
+    def add_recorder(self, recorder, session):
+        """ Write every session frame with recorder """
+        if not self.recorders:
+            self.recorder_session = session
+            session.subscribe(self.on_recorder_frames)
+        self.recorders = self.recorders + [recorder]
+
+
+    def on_recorder_frames(self, frames):
+        """ Session subscriber: runs in serial reader thread """
+        for recorder in self.recorders:
+            recorder.write_frames(frames)
+
+
+    def close_recorders(self):
+        """ Stop recording, writer threads close the files """
+        if not self.recorders:
+            return
+        self.recorder_session.unsubscribe(self.on_recorder_frames)
+        recorders = self.recorders
+        self.recorders = []
+        for recorder in recorders:
+            for writer in recorder.close():
+                writer.close()
+                self.closed_writers.append(writer)
+
+
+    def open_writer(self):
+        """ Start writer thread and write start time """
+        self.writer = LogWriter(self.log_file_path, *self.writer_config,
+                                worker=self.segment_worker,
+                                segment_header=self.text_segment_header,
+                                indexer=self.make_indexer(TextIndexer))
+        current_datetime = datetime.now().strftime("%Y-%m-%d-%H-%M-%S")
+        self.writer.write("Tauno-Monitor log started: " + current_datetime + "\n")
+
+
+    def text_segment_header(self):
+        current_datetime = datetime.now().strftime("%Y-%m-%d-%H-%M-%S")
+        return "Tauno-Monitor log continued: " + current_datetime + "\n"
+
 
     def write_data(self, data):
-        """ Writes data to log file. Adds start time. """
+        """ Writes note to text log file """
         #print("log:write_data()")
-        if self.window_reference.write_logs:
-            try:
-                if self.file_handle is None:
-                    # Use exclusive open for first write
-                    self.file_handle = open(self.log_file_path, 'a')
-                    # Verify file descriptor
-                    os.fstat(self.file_handle.fileno())
-                    # Write start time
-                    current_datetime = datetime.now().strftime("%Y-%m-%d-%H-%M-%S")
-                    self.write_data("Tauno-Monitor log started: " + current_datetime + "\n")
-
-                self.file_handle.write(data)
-                # print(f"log write data: {data}")
-            except (OSError, IOError) as e:
-                print(f"Error writing data: {e}")
-                self.file_handle = None
-
-
-    def write_hex_data(self, data):
-        """ Write HEX data in a nice format """
-
-        print("log:write_hex_data()")
-
-        if self.window_reference.write_logs:
-            # Open the file the first time the method is called
-            if self.file_handle is None:
-                self.file_handle = open(self.log_file_path, 'a')
-                # Write start time
-                current_datetime = datetime.now().strftime("%Y-%m-%d-%H-%M-%S")
-                self.write_data("Tauno-Monitor log started: " + current_datetime + "\n")
-            # Write data to the file
-            self.file_handle.write(data)
-            self.file_handle.write(' ')
-            self.hex_counter += 1
-            if self.hex_counter == 16:
-                self.file_handle.write('\n')
-                self.hex_counter = 0
+        if self.window_reference.write_logs and self.writer is not None:
+            self.writer.write(data)
+
 
     def close_file(self):
         """ Closes log file. Adds end time, """
 
-        print("log:close_file()")
+        trace.debug("log:close_file()")
+
+        self.close_recorders()
+        self.close_text_session()
+        if not self.log_file_path:
+            return
 
         # Write end time
         current_datetime = datetime.now().strftime("%Y-%m-%d-%H-%M-%S")
         self.write_data("\nTauno-Monitor log ended: " + current_datetime + "\n\n")
-        # Close file
-        if self.file_handle is not None:
-            self.file_handle.close()
-            self.file_handle = None
-
+        # Writer thread closes the file when everything is written
+        if self.writer is not None:
+            self.writer.close()
+            self.closed_writers = [w for w in self.closed_writers if w.thread.is_alive()]
+            self.closed_writers.append(self.writer)
+            self.writer = None
+        self.log_file_path = ''
@@ -0,0 +1,122 @@
+# File:    tauno_recovery.py
+# Author:  Tauno Erik
+# Started: 18.10.2026
+# Edited:  18.10.2026
+# Repairs logs and captures left open by a crash or power loss.
+#
+# LogWriter (tauno_logging.py) keeps a hidden marker file
+# (.<log name>.open) next to every file it has open and removes it
+# after a clean close. A marker found on start means the file may end
+# with a half written record or line, or with zeros after a power loss.
+# The file is cut to the last good capture record (CRC-32 checked)
+# or to the last full line of a text log.
+
+import glob
+import os
+from collections import namedtuple
+from .tauno_capture import CAPTURE_EXTENSION, CaptureReader, CaptureError, HEADER, RECORD
+from .tauno_index import trim_index
+from .tauno_trace import get_tracer
+
+trace = get_tracer('log')
+
+MARKER_SUFFIX = '.open'
+
+# Bytes read at a time from the end of a text log
+TAIL_BLOCK = 64 * 1024
+
+# size: file size after recovery
+# lost: bytes cut from the end
+RecoveryResult = namedtuple('RecoveryResult', ['file_path', 'size', 'lost'])
+
+
+def marker_path(file_path):
+    """ Hidden marker file next to file_path """
+    folder, name = os.path.split(file_path)
+    return os.path.join(folder, '.' + name + MARKER_SUFFIX)
+
+
+def mark_open(file_path):
+    try:
+        open(marker_path(file_path), 'w').close()
+    except (OSError, IOError) as e:
+        trace.error("Error creating marker: %s", e)
+
+
+def mark_closed(file_path):
+    try:
+        os.remove(marker_path(file_path))
+    except FileNotFoundError:
+        pass
+    except (OSError, IOError) as e:
+        trace.error("Error removing marker: %s", e)
+
+
+def capture_good_size(file_path):
+    """ End of the last good record of a capture """
+    try:
+        reader = CaptureReader(file_path)
+    except CaptureError:
+        # Header was not written: nothing to keep
+        if os.path.getsize(file_path) < HEADER.size:
+            return 0
+        raise
+    with reader:
+        end = HEADER.size
+        for record in reader.records(port_names=True):
+            end = record.offset + RECORD.size + len(record.data)
+        return end
+
+
+def text_good_size(file_path):
+    """ End of the last full line, zeros at the end are not text """
+    with open(file_path, 'rb') as file_handle:
+        end = file_handle.seek(0, os.SEEK_END)
+        while end > 0:
+            start = max(0, end - TAIL_BLOCK)
+            file_handle.seek(start)
+            block = file_handle.read(end - start).rstrip(b'\0')
+            newline = block.rfind(b'\n')
+            if newline >= 0:
+                return start + newline + 1
+            end = start
+        return 0
+
+
+def recover_file(file_path):
+    """ Cut file to its last good record or line. Returns RecoveryResult. """
+    size = os.path.getsize(file_path)
+    if file_path.endswith(CAPTURE_EXTENSION):
+        good_size = capture_good_size(file_path)
+    else:
+        good_size = text_good_size(file_path)
+    if good_size < size:
+        os.truncate(file_path, good_size)
+        trim_index(file_path, good_size)
+        trace.warning("Recovered %s: %d bytes lost", file_path, size - good_size)
+    return RecoveryResult(file_path, good_size, size - good_size)
+
+
+def open_files(folder):
+    """ Files in folder that have a marker """
+    markers = glob.glob(os.path.join(glob.escape(folder), '.*' + MARKER_SUFFIX))
+    return [os.path.join(folder, os.path.basename(marker)[1:-len(MARKER_SUFFIX)])
+            for marker in sorted(markers)]
+
+
+def recover_files(file_paths):
+    """
+    Recover files found by open_files(), markers are removed.
+    A file that can not be recovered is left as it is, its marker
+    is removed too, so it is not tried again on every start.
+    Returns list of RecoveryResult.
+    """
+    results = []
+    for file_path in file_paths:
+        try:
+            if os.path.exists(file_path):
+                results.append(recover_file(file_path))
+        except (OSError, CaptureError) as e:
+            trace.error("Error recovering %s: %s", file_path, e)
+        mark_closed(file_path)
+    return results
@@ -0,0 +1,154 @@
+# File:    tauno_replay.py
+# Author:  Tauno Erik
+# Started: 18.10.2026
+# Edited:  18.10.2026
+# Plays a capture file (tauno_capture.py) into a SerialSession
+# as if the data came from the serial port. Streams of a split capture
+# are played together in time order.
+
+import threading
+import time
+from .tauno_capture import open_capture
+from .tauno_session import Frame, RX, TX
+from .tauno_trace import get_tracer
+
+trace = get_tracer('replay')
+
+# Replay speed 0 = as fast as possible
+REPLAY_FAST = 0
+
+
+class CaptureReplay():
+    """
+    Feeds RX records of a capture to session.receive(), so they go
+    through the same framing, display and logging path as live data.
+    TX records are published as TX frames, nothing is written to a port.
+    Frames are stamped with record time, scaled by speed, so time based
+    framers see the recorded gaps also when replay runs fast.
+
+    file_paths: capture file, or all streams of a split capture
+    speed: 1.0 = original timing, 2.0 = twice as fast, 0 = as fast as possible
+    on_done(replay): called in replay thread when finished or stopped
+    """
+
+    def __init__(self, file_paths, session, speed=1.0, on_done=None):
+        self.file_paths = file_paths
+        self.session = session
+        self.speed = speed
+        self.on_done = on_done
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.error = None
+
+        # Statistics
+        self.records = 0
+        self.bytes = 0
+        self.frames = 0
+        self.started = 0
+        self.finished = 0
+
+
+    @property
+    def running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+
+    @property
+    def elapsed(self):
+        """ Seconds from start to end (or now) """
+        end = self.finished or time.monotonic()
+        return end - self.started if self.started else 0
+
+
+    def frames_per_second(self):
+        elapsed = self.elapsed
+        return self.frames / elapsed if elapsed > 0 else 0
+
+
+    def start(self):
+        """ Start replay thread """
+        self.thread = threading.Thread(target=self.run)
+        self.thread.daemon = True
+        self.thread.start()
+
+
+    def stop(self):
+        """ Stop replay, on_done is still called """
+        self.stop_event.set()
+
+
+    def on_frames(self, frames):
+        """ Session subscriber: count frames made from replayed data """
+        for frame in frames:
+            if frame.direction == RX:
+                self.frames += 1
+
+
+    def wait_until(self, target):
+        """
+        Sleep until monotonic time target. Time based framers
+        are polled like the serial reader does when no data comes.
+        Returns False if stopped.
+        """
+        session = self.session
+        while True:
+            left = target - time.monotonic()
+            if left <= 0:
+                return not self.stop_event.is_set()
+            poll_interval = session.framer.poll_interval
+            if poll_interval is None:
+                if self.stop_event.wait(left):
+                    return False
+            else:
+                if self.stop_event.wait(min(left, poll_interval)):
+                    return False
+                session.poll()
+
+
+    def run(self):
+        """ Replay thread """
+        session = self.session
+        session.subscribe(self.on_frames)
+        self.started = time.monotonic()
+        try:
+            # Replay clock: start time + record offset / speed
+            start_ns = time.monotonic_ns()
+            start_wall = time.time()
+            # As fast as possible keeps the recorded gaps
+            scale = self.speed if self.speed > 0 else 1
+            with open_capture(self.file_paths) as reader:
+                first_ns = None
+                mono_ns = start_ns
+                wall_time = start_wall
+                rx_port = None
+                for record in reader:
+                    if self.stop_event.is_set():
+                        break
+                    if first_ns is None:
+                        first_ns = record.mono_ns
+                    offset_ns = int((record.mono_ns - first_ns) / scale)
+                    if self.speed > 0:
+                        if not self.wait_until(self.started + offset_ns / 1e9):
+                            break
+
+                    mono_ns = start_ns + offset_ns
+                    wall_time = start_wall + offset_ns / 1e9
+                    if record.direction == RX:
+                        rx_port = record.port
+                        session.receive(record.data, port=record.port,
+                                        mono_ns=mono_ns, wall_time=wall_time)
+                    elif record.direction == TX:
+                        session.publish([Frame(mono_ns, wall_time, TX,
+                                               record.port, record.data)])
+                    self.records += 1
+                    self.bytes += len(record.data)
+                else:
+                    session.end_input(rx_port, mono_ns, wall_time)
+        except Exception as ex:
+            trace.error("Replay error: %s", ex)
+            self.error = ex
+        finally:
+            self.finished = time.monotonic()
+            session.unsubscribe(self.on_frames)
+            if self.on_done is not None:
+                self.on_done(self)
@@ -0,0 +1,145 @@
+# File:    tauno_rotation.py
+# Author:  Tauno Erik
+# Started: 18.10.2026
+# Edited:  18.10.2026
+# Log rotation: new segment file by size or time,
+# compression and deletion of old segments in a worker thread.
+
+import gzip
+import lzma
+import os
+import queue
+import shutil
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from .tauno_index import INDEX_SUFFIX
+from .tauno_trace import get_tracer
+
+trace = get_tracer('log')
+
+# Segment names (gschema log-rotate-naming)
+ROTATE_NAMINGS = ['numbered', 'timestamp']
+# Compression of closed segments (gschema log-compression)
+COMPRESSIONS = ['none', 'gzip', 'xz']
+COMPRESSION_SUFFIXES = {'gzip': '.gz', 'xz': '.xz'}
+COMPRESSION_OPENERS = {'gzip': gzip.open, 'xz': lzma.open}
+
+COPY_BLOCK_SIZE = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class RotationConfig():
+    """
+    When to start a new log segment and what to do with old ones.
+    0 = no limit.
+    """
+    max_bytes: int = 0
+    max_seconds: int = 0
+    naming: str = 'numbered'
+    compression: str = 'none'
+    keep: int = 0
+
+    @classmethod
+    def from_settings(cls, settings):
+        """ Make config from Gio.Settings """
+        return cls(
+            max_bytes=settings.get_int("log-rotate-size") * 1024 * 1024,
+            max_seconds=settings.get_int("log-rotate-interval") * 60,
+            naming=settings.get_string("log-rotate-naming"),
+            compression=settings.get_string("log-compression"),
+            keep=settings.get_int("log-keep-segments"),
+        )
+
+
+    @property
+    def enabled(self):
+        return self.max_bytes > 0 or self.max_seconds > 0
+
+
+def segment_path(first_path, number, naming):
+    """
+    Path of segment number (first segment is 0):
+    log.txt -> log-001.txt or log-2026-10-18-12-00-00.txt
+    """
+    if number == 0:
+        return first_path
+    root, ext = os.path.splitext(first_path)
+    if naming == 'timestamp':
+        path = root + datetime.now().strftime("-%Y-%m-%d-%H-%M-%S") + ext
+        if os.path.exists(path):
+            path = f"{root}{datetime.now().strftime('-%Y-%m-%d-%H-%M-%S')}-{number}{ext}"
+        return path
+    return f"{root}-{number:03d}{ext}"
+
+
+def compress_file(path, compression):
+    """
+    Compress file to path.gz or path.xz and remove the original.
+    Its index has offsets into the uncompressed file, so it is removed too.
+    """
+    opener = COMPRESSION_OPENERS.get(compression)
+    if opener is None:
+        return
+    # Original is removed only when the copy is complete
+    with open(path, 'rb') as source, opener(path + COMPRESSION_SUFFIXES[compression], 'wb') as target:
+        shutil.copyfileobj(source, target, COPY_BLOCK_SIZE)
+    os.remove(path)
+    try:
+        os.remove(path + INDEX_SUFFIX)
+    except FileNotFoundError:
+        pass
+
+
+def delete_segment(path):
+    """ Remove segment, its compressed copies and its index """
+    for suffix in ('', INDEX_SUFFIX) + tuple(COMPRESSION_SUFFIXES.values()):
+        try:
+            os.remove(path + suffix)
+        except FileNotFoundError:
+            pass
+
+
+class SegmentWorker():
+    """
+    Thread that compresses and deletes closed segments one by one,
+    so the log writer can go on writing.
+    """
+
+    def __init__(self):
+        self.jobs = queue.Queue()
+        self.thread = None
+        self.lock = threading.Lock()
+
+
+    def add(self, function, *args):
+        """ Run function(*args) in worker thread """
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self.run)
+                self.thread.daemon = True
+                self.thread.start()
+            self.jobs.put((function, args))
+
+
+    def stop(self, timeout):
+        """ Finish jobs and stop thread """
+        with self.lock:
+            thread = self.thread
+            if thread is None:
+                return
+            self.jobs.put(None)
+            self.thread = None
+        thread.join(timeout)
+
+
+    def run(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                return
+            function, args = job
+            try:
+                function(*args)
+            except (OSError, IOError, EOFError) as e:
+                trace.error("Log segment error: %s", e)
@@ -0,0 +1,105 @@
+# File:    tauno_rx_queue.py
+# Author:  Tauno Erik
+# Started: 18.10.2026
+# Edited:  18.10.2026
+# Received data queue between serial reader thread and GTK main loop
+
+import threading
+from collections import deque
+from .tauno_trace import get_tracer
+
+trace = get_tracer('rx')
+
+# What to drop from display when the queue is full
+OVERFLOW_POLICIES = ['drop-oldest', 'drop-newest']
+
+class RxQueue():
+    """
+    Reader thread puts data in, GTK main loop takes all of it out
+    once per frame.
+
+    Queue holds at most max_size items for display. Items over
+    the limit are dropped by policy. Logs are written from the
+    serial session, so they never lose dropped items.
+    """
+
+    def __init__(self, on_ready, max_size=10000, policy='drop-oldest'):
+        # Called from the reader thread when the consumer
+        # is not scheduled yet
+        self.on_ready = on_ready
+        self.lock = threading.Lock()
+        self.items = deque()
+        self.scheduled = False
+
+        self.max_size = max_size
+        self.policy = policy
+
+        # Statistics
+        self.dropped = 0
+        self.high_water = 0
+
+
+    def configure(self, max_size, policy):
+        """ Set size limit and overflow policy """
+        if policy not in OVERFLOW_POLICIES:
+            trace.warning("Unknown RX queue policy: %s", policy)
+            policy = OVERFLOW_POLICIES[0]
+        with self.lock:
+            self.max_size = max(1, max_size)
+            self.policy = policy
+
+
+    def reset_stats(self):
+        """ Clear dropped and high-water counters """
+        with self.lock:
+            self.dropped = 0
+            self.high_water = 0
+
+
+    def is_idle(self):
+        """ True when consumer has taken everything and stopped """
+        with self.lock:
+            return not self.scheduled
+
+
+    def put(self, item):
+        """ Add one item """
+        self.put_many((item,))
+
+
+    def put_many(self, items):
+        """ Add list of items """
+        with self.lock:
+            self.items.extend(items)
+            size = len(self.items)
+            if size > self.high_water:
+                self.high_water = size
+
+            over = size - self.max_size
+            if over > 0:
+                self.dropped += over
+                if self.policy == 'drop-newest':
+                    for _ in range(over):
+                        self.items.pop()
+                else:
+                    for _ in range(over):
+                        self.items.popleft()
+
+            if self.scheduled:
+                return
+            self.scheduled = True
+        self.on_ready()
+
+
+    def drain(self):
+        """
+        Take all items.
+        Empty list means the consumer can stop until next on_ready() call.
+        """
+        with self.lock:
+            if not self.items:
+                self.scheduled = False
+                return []
+            items = list(self.items)
+            self.items.clear()
+        return items
@@ -1,140 +1,135 @@
 # File:    tauno_serial.py
 # Author:  Tauno Erik
 # Started: 18.06.2025
-# Edited:  11.02.2026
+# Edited:  18.10.2026
+# Connects window settings to SerialSession (tauno_session.py)
 
 import serial
 import serial.tools.list_ports
 from gi.repository import Adw, Gtk, Gio, GObject, GLib, Gdk
+from .tauno_session import SerialSession
+from .tauno_framing import (RawFramer, DelimiterFramer, FixedLengthFramer,
+                            LengthPrefixFramer, IdleGapFramer, parse_delimiter)
+from .tauno_trace import get_tracer
+
+trace = get_tracer('serial')
+
+# RX line ends (index: window.py serial_rx_line_endings)
+RX_LINE_ENDS = [b'\n', b'\r', b'\r\n', b';', b'']
+
+# Preferences indexes (preferences.py) to pyserial values
+BYTESIZES = [serial.FIVEBITS, serial.SIXBITS, serial.SEVENBITS, serial.EIGHTBITS]
+PARITIES = [serial.PARITY_NONE, serial.PARITY_EVEN, serial.PARITY_ODD,
+            serial.PARITY_MARK, serial.PARITY_SPACE]
+STOPBITS = [serial.STOPBITS_ONE, serial.STOPBITS_ONE_POINT_FIVE, serial.STOPBITS_TWO]
+
+
+def make_framer(config):
+    """ Framer for display settings snapshot """
+    try:
+        if config.framing == 'delimiter':
+            return DelimiterFramer(parse_delimiter(config.frame_delimiter))
+        if config.framing == 'fixed-length':
+            return FixedLengthFramer(config.frame_length)
+        if config.framing == 'length-prefix':
+            return LengthPrefixFramer(config.frame_prefix_size, config.frame_prefix_byteorder)
+        if config.framing == 'idle-gap':
+            return IdleGapFramer(config.frame_idle_ms)
+    except ValueError as ex:
+        trace.error("RX framing error: %s", ex)
+
+    # 'line-end': HEX shows bytes, not lines
+    end = RX_LINE_ENDS[config.rx_line_end_index]
+    if config.rx_format == 'HEX' or end == b'':
+        return RawFramer()
+    return DelimiterFramer(end)
+
 
 class TaunoSerial():
 
     def __init__(self, window_reference):
         self.window_reference = window_reference
-        self.is_open = False
-        self.tauno_serial = serial.Serial()
+        self.session = SerialSession()
+        self.session.on_error = self.on_read_error
+        self.session.subscribe(self.on_frames)
+        self.framing_key = None
+        self.apply_config(self.window_reference.display_config)
+
+
+    @property
+    def is_open(self):
+        return self.session.is_open
+
+
+    def apply_config(self, config):
+        """ Set framing from display settings snapshot """
+        # New framer only if framing settings are changed
+        framing_key = config.framing_key()
+        if framing_key != self.framing_key:
+            self.framing_key = framing_key
+            self.session.set_framer(make_framer(config))
+
+        if config.rx_format == 'ASCII':
+            self.session.set_text_decoding(config.decode_errors)
+        else:
+            self.session.set_text_decoding(None)
 
 
     def open(self, port, baud):
         """ Open to serial port """
         # Close if already open
-        if self.tauno_serial.is_open:
-            print("Already open: Close()")
+        if self.session.serial.is_open:
+            trace.debug("Already open: Close()")
             self.close()
         else:
             # Open Serial port
-            print("Open Port: " + port)
-            self.tauno_serial.baudrate = baud
-            print(f"Open Baud: {baud}")
-            self.tauno_serial.port = port
-
-            # Data Bit (index: main.py)
-            bytesize_index = self.window_reference.get_data_bit_saved
-            if bytesize_index == 0:
-                self.tauno_serial.bytesize = serial.FIVEBITS
-            elif bytesize_index == 1:
-                self.tauno_serial.bytesize = serial.SIXBITS
-            elif bytesize_index == 2:
-                self.tauno_serial.bytesize = serial.SEVENBITS
-            elif bytesize_index == 3:
-                self.tauno_serial.bytesize = serial.EIGHTBITS
-
-            # Parity
-            parity_index = self.window_reference.get_parity_saved
-
-            if parity_index == 0:
-                self.tauno_serial.parity = serial.PARITY_NONE
-            elif parity_index == 1:
-                self.tauno_serial.parity = serial.PARITY_EVEN
-            elif parity_index == 2:
-                self.tauno_serial.parity = serial.PARITY_ODD
-            elif parity_index == 3:
-                self.tauno_serial.parity = serial.PARITY_MARK
-            elif parity_index == 4:
-                self.tauno_serial.parity = serial.PARITY_SPACE
-
-            # Stopbit
-            stopbit_index = self.window_reference.get_stop_bit_saved
-
-            if stopbit_index == 0:
-                self.tauno_serial.stopbits = serial.STOPBITS_ONE
-            elif stopbit_index == 1:
-                self.tauno_serial.stopbits = serial.STOPBITS_ONE_POINT_FIVE
-            elif stopbit_index == 2:
-                self.tauno_serial.stopbits = serial.STOPBITS_TWO
-
-            # TODO:
-            #self.tauno_serial.timeout = 1
-
-            self.tauno_serial.open()
-            #self.tauno_serial.flushInput() # Clear any old data in the buffer
-            self.tauno_serial.reset_input_buffer()  # Modern pyserial API
-
-            if self.tauno_serial.is_open:
-                self.is_open = True
-                print("Opened Serial Port successfully")
+            trace.info("Open Port: %s", port)
+            trace.info("Open Baud: %s", baud)
+
+            self.session.open(port, baud,
+                              bytesize=BYTESIZES[self.window_reference.get_data_bit_saved],
+                              parity=PARITIES[self.window_reference.get_parity_saved],
+                              stopbits=STOPBITS[self.window_reference.get_stop_bit_saved])
+
+            if self.session.is_open:
+                trace.info("Opened Serial Port successfully")
             else:
-                print("Unable to open: " + port + " " + baud)
+                trace.error("Unable to open: %s %s", port, baud)
 
 
     def close(self):
         """ Close serial port """
-        print("Close(): " + str(self.tauno_serial.port) + " " + str(self.tauno_serial.baudrate) )
-        self.tauno_serial.close()
-        if self.tauno_serial.is_open is False:
-            self.is_open = False
-            print("Closed Serial Port successfully")
+        port = self.session.serial
+        trace.debug("Close(): %s %s", port.port, port.baudrate)
+        self.session.close()
+        if self.session.is_open is False:
+            trace.info("Closed Serial Port successfully")
         else:
-            print("Unable to open: " + str(self.tauno_serial.port) + " " + str(self.tauno_serial.baudrate) )
-
-
-    def read(self):
-        """
-        Read byte while serial port is open
-        """
-        while self.is_open:
-            # bytes(HEX) or line?
-            type = self.window_reference.get_rx_format_saved
-
-            end_index = self.window_reference.get_RX_line_end_saved
-            if end_index == 0:
-                end = b'\n'
-            elif end_index == 1:
-                end = b'\r'
-            elif end_index == 2:
-                end = b'\r\n'
-            elif end_index == 3:
-                end = b';'
-            elif end_index == 4: #None
-                end = b''
-
-            try:
-                if type == 'HEX':
-                    # read a byte
-                    #print("try=HEX")
-                    data_in = self.tauno_serial.read()
-                else:
-                    if end_index == 4:
-                        data_in = self.tauno_serial.read()
-                    else:
-                        #print("try=ASCII")
-                        # Read a line until selected end
-                        data_in = self.tauno_serial.read_until(expected=end)
-                GLib.idle_add(self.window_reference.add_to_text_view, data_in)
-            except Exception as ex:
-                print("Serial read error: ", ex)
-                # Close serial port
-                if self.tauno_serial.is_open:
-                    self.window_reference.reconnect_serial(self.tauno_serial.port, self.tauno_serial.baudrate)
-                return
+            trace.error("Unable to open: %s %s", port.port, port.baudrate)
+
+
+    def start(self):
+        """ Start reading in a thread """
+        self.session.start()
+
+
+    def on_frames(self, frames):
+        """ Session subscriber: RX and TX frames to window queue """
+        self.window_reference.rx_queue.put_many(frames)
+
+
+    def on_read_error(self, ex):
+        """ Port lost while reading """
+        port = self.session.serial
+        self.window_reference.reconnect_serial(port.port, port.baudrate)
 
 
     def write(self, data):
         """ Write to serial port """
-        print(f"Serial Port Write:{data}")
+        trace.debug("Serial Port Write: %s", data)
 
-        if not self.tauno_serial.is_open:
-            print("not open")
+        if not self.session.serial.is_open:
+            trace.warning("not open")
             return
 
         # Sanitize control characters
@@ -143,10 +138,7 @@ class TaunoSerial():
         # Limit length to prevent buffer overflow on device
         MAX_LENGTH = 1024
         if len(data) > MAX_LENGTH:
-            print(f"Warning: Data truncated to {MAX_LENGTH} bytes")
+            trace.warning("Warning: Data truncated to %s bytes", MAX_LENGTH)
             data = data[:MAX_LENGTH]
 
-        self.tauno_serial.write(data.encode('utf-8'))
-        self.tauno_serial.flush()
-
-
+        self.session.write(data.encode('utf-8'))
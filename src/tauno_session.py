@@ -0,0 +1,236 @@
+# File:    tauno_session.py
+# Author:  Tauno Erik
+# Started: 18.10.2026
+# Edited:  18.10.2026
+# Serial session engine: port, reader thread, framing and timestamps.
+# Does not use GTK, can run without a display.
+
+import codecs
+import threading
+import time
+from collections import namedtuple
+import serial
+from .tauno_framing import DelimiterFramer
+from .tauno_trace import get_tracer
+
+trace = get_tracer('serial')
+
+# Frame directions
+RX = 'RX'
+TX = 'TX'
+
+# One received or sent piece of data. Never changed after creation.
+# mono_ns:   time.monotonic_ns() when data was read or written
+# wall_time: time.time() at the same moment
+# text:      data decoded as UTF-8, None if text decoding is off
+Frame = namedtuple('Frame', ['mono_ns', 'wall_time', 'direction', 'port', 'data', 'text'],
+                   defaults=(None,))
+
+# UTF-8 decoding error policies (see codecs error handlers)
+DECODE_ERRORS = ['replace', 'backslashreplace', 'ignore']
+
+# Max bytes taken from the port in one read() call
+READ_BLOCK_SIZE = 4096
+# Seconds read() waits for the first byte
+READ_TIMEOUT = 0.05
+
+
+class SerialSession():
+    """
+    Serial port and its reader thread.
+
+    Received data is cut into frames by a framer (tauno_framing.py)
+    and given to every subscriber.
+    A subscriber is a function callback(frames), where frames is a list
+    of Frame objects from one read. Callbacks run in the reader thread,
+    so they must be quick: put frames into a queue and return.
+    """
+
+    def __init__(self):
+        self.serial = serial.Serial()
+        self.is_open = False
+        # List is replaced, not changed, so the reader thread
+        # can loop over it without a lock
+        self.subscribers = []
+        # Cuts received bytes to frames, changed with set_framer()
+        self.framer = DelimiterFramer(b'\n')
+        self.framer_lock = threading.Lock()
+        self.read_timeout = READ_TIMEOUT
+        # Incremental UTF-8 decoder, None = no text decoding
+        self.decoder = None
+        self.thread = None
+        # Called from reader thread when the port fails: on_error(exception)
+        self.on_error = None
+
+
+    def subscribe(self, callback):
+        """ Add frames consumer """
+        self.subscribers = self.subscribers + [callback]
+
+
+    def unsubscribe(self, callback):
+        """ Remove frames consumer """
+        self.subscribers = [s for s in self.subscribers if s != callback]
+
+
+    def set_text_decoding(self, errors):
+        """
+        Decode RX frames as UTF-8. Characters split between reads are kept
+        until the rest arrives. errors: one of DECODE_ERRORS, None = off
+        """
+        if errors is None:
+            self.decoder = None
+            return
+        if errors not in DECODE_ERRORS:
+            trace.warning("Unknown decode error policy: %s", errors)
+            errors = DECODE_ERRORS[0]
+        if self.decoder is None or self.decoder.errors != errors:
+            self.decoder = codecs.getincrementaldecoder('utf-8')(errors=errors)
+
+
+    def set_framer(self, framer):
+        """
+        Use new framer. Bytes waiting in the old framer are
+        given to the new one, so nothing is lost.
+        """
+        with self.framer_lock:
+            old = self.framer
+            self.framer = framer
+            pending = old.flush()
+            if pending:
+                mono_ns = time.monotonic_ns()
+                self.publish_rx(framer.feed(pending, mono_ns), mono_ns, time.time())
+
+        # Idle gap framer needs read() to return more often
+        if framer.poll_interval is None:
+            self.read_timeout = READ_TIMEOUT
+        else:
+            self.read_timeout = min(READ_TIMEOUT, framer.poll_interval)
+        if self.serial.is_open and self.serial.timeout != self.read_timeout:
+            self.serial.timeout = self.read_timeout
+
+
+    def open(self, port, baudrate, bytesize=serial.EIGHTBITS,
+             parity=serial.PARITY_NONE, stopbits=serial.STOPBITS_ONE):
+        """ Open serial port. Raises serial.SerialException on failure. """
+        self.serial.port = port
+        self.serial.baudrate = baudrate
+        self.serial.bytesize = bytesize
+        self.serial.parity = parity
+        self.serial.stopbits = stopbits
+        # Short timeout, so read() returns and the loop can see is_open
+        self.serial.timeout = self.read_timeout
+
+        self.serial.open()
+        self.serial.reset_input_buffer()
+        with self.framer_lock:
+            self.framer.flush()
+        if self.decoder is not None:
+            self.decoder.reset()
+        self.is_open = self.serial.is_open
+
+
+    def close(self):
+        """ Close serial port. Reader thread stops after its next read. """
+        self.serial.close()
+        self.is_open = self.serial.is_open
+
+
+    def start(self):
+        """ Start reader thread """
+        self.thread = threading.Thread(target=self.read_loop)
+        self.thread.daemon = True
+        self.thread.start()
+
+
+    def read_loop(self):
+        """
+        Read data while serial port is open.
+        Takes everything waiting in the input buffer with one call.
+        """
+        while self.is_open:
+            try:
+                waiting = self.serial.in_waiting
+                # Nothing waiting: block for one byte until timeout
+                chunk = self.serial.read(min(max(waiting, 1), READ_BLOCK_SIZE))
+            except Exception as ex:
+                trace.error("Serial read error: %s", ex)
+                if self.serial.is_open and self.on_error is not None:
+                    self.on_error(ex)
+                return
+
+            if chunk:
+                self.receive(chunk)
+            elif self.framer.poll_interval is not None:
+                self.poll()
+
+
+    def receive(self, chunk, port=None, mono_ns=None, wall_time=None):
+        """
+        Cut received bytes into frames and publish them.
+        Can be used to feed data that does not come from the port
+        (see tauno_replay.py). port: name for frames, None = serial port
+        mono_ns, wall_time: when data was received, None = now
+        """
+        if mono_ns is None:
+            mono_ns = time.monotonic_ns()
+        if wall_time is None:
+            wall_time = time.time()
+        with self.framer_lock:
+            pieces = self.framer.feed(chunk, mono_ns)
+            if pieces:
+                self.publish_rx(pieces, mono_ns, wall_time, port)
+
+
+    def poll(self):
+        """ No data received: let time based framer end its frame """
+        mono_ns = time.monotonic_ns()
+        with self.framer_lock:
+            pieces = self.framer.poll(mono_ns)
+            if pieces:
+                self.publish_rx(pieces, mono_ns, time.time())
+
+
+    def end_input(self, port=None, mono_ns=None, wall_time=None):
+        """
+        Fed data has ended (see tauno_replay.py): time based framer
+        ends its waiting frame, no more data can make it longer.
+        """
+        if mono_ns is None:
+            mono_ns = time.monotonic_ns()
+        if wall_time is None:
+            wall_time = time.time()
+        with self.framer_lock:
+            if self.framer.poll_interval is None:
+                return
+            pending = self.framer.flush()
+            if pending:
+                self.publish_rx([pending], mono_ns, wall_time, port)
+
+
+    def publish_rx(self, pieces, mono_ns, wall_time, port=None):
+        """ Make RX frames from pieces and publish them """
+        if port is None:
+            port = self.serial.port
+        decoder = self.decoder
+        if decoder is None:
+            frames = [Frame(mono_ns, wall_time, RX, port, piece) for piece in pieces]
+        else:
+            frames = [Frame(mono_ns, wall_time, RX, port, piece, decoder.decode(piece))
+                      for piece in pieces]
+        self.publish(frames)
+
+
+    def write(self, data):
+        """ Write bytes to serial port and publish them as TX frame """
+        mono_ns = time.monotonic_ns()
+        wall_time = time.time()
+        self.serial.write(data)
+        self.serial.flush()
+        self.publish([Frame(mono_ns, wall_time, TX, self.serial.port, data)])
+
+
+    def publish(self, frames):
+        """ Give frames to all subscribers """
+        for callback in self.subscribers:
+            callback(frames)
@@ -0,0 +1,105 @@
+# File:    tauno_structured.py
+# Author:  Tauno Erik
+# Started: 18.10.2026
+# Edited:  18.10.2026
+# Structured logs: one JSON Lines or CSV record per frame.
+# Records are made with string templates, no dict per frame.
+#
+# Fields: time (ISO 8601, local time with offset), mono_ns,
+#         dir (RX/TX), port, hex (raw bytes), text (UTF-8 decoded)
+
+import threading
+import time
+from json.encoder import encode_basestring_ascii
+
+CSV_HEADER = 'time,mono_ns,dir,port,hex,text\n'
+
+
+class StructuredEncoder():
+    """
+    Base for frame encoders. Timestamp text is made once per second,
+    only microseconds are added per frame.
+    Runs in the serial reader thread (RX) and GTK thread (TX),
+    the cached second is used under lock.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.second = None
+        self.second_text = ''
+        self.zone_text = ''
+
+
+    def iso_time(self, wall_time):
+        """ Call with lock held """
+        second = int(wall_time)
+        if second != self.second:
+            local = time.localtime(second)
+            self.second = second
+            self.second_text = time.strftime('%Y-%m-%dT%H:%M:%S', local)
+            zone = time.strftime('%z', local)
+            self.zone_text = zone[:3] + ':' + zone[3:]
+        return f"{self.second_text}.{int((wall_time - second) * 1e6):06d}{self.zone_text}"
+
+
+    def header(self):
+        """ Text at the start of every file or segment """
+        return ''
+
+
+def frame_text(frame):
+    """ Decoded text of frame, RX frames may already have it """
+    if frame.text is not None:
+        return frame.text
+    return frame.data.decode('utf-8', 'replace')
+
+
+class JsonLinesEncoder(StructuredEncoder):
+    """ One JSON object per line """
+
+    extension = '.jsonl'
+
+    def encode(self, frames):
+        iso_time = self.iso_time
+        quote = encode_basestring_ascii
+        with self.lock:
+            return ''.join([
+                f'{{"time":"{iso_time(frame.wall_time)}","mono_ns":{frame.mono_ns},'
+                f'"dir":"{frame.direction}","port":{quote(str(frame.port))},'
+                f'"hex":"{frame.data.hex()}","text":{quote(frame_text(frame))}}}\n'
+                for frame in frames])
+
+
+def csv_quote(text):
+    """
+    Quoted CSV field. Backslash is written as \\\\ and line ends
+    as \\r \\n, so a record is one line and can be read back exactly.
+    """
+    return '"' + (text.replace('\\', '\\\\').replace('"', '""')
+                  .replace('\r', '\\r').replace('\n', '\\n')) + '"'
+
+
+class CsvEncoder(StructuredEncoder):
+    """
+    CSV with header row, one record per line. Fields are quoted like
+    RFC 4180, except CR, LF and backslash are escaped (csv_quote).
+    The hex field always has the exact bytes.
+    """
+
+    extension = '.csv'
+
+    def header(self):
+        return CSV_HEADER
+
+
+    def encode(self, frames):
+        iso_time = self.iso_time
+        with self.lock:
+            return ''.join([
+                f'{iso_time(frame.wall_time)},{frame.mono_ns},{frame.direction},'
+                f'{csv_quote(str(frame.port))},{frame.data.hex()},{csv_quote(frame_text(frame))}\n'
+                for frame in frames])
+
+
+# Log format (gschema log-format): encoder class
+STRUCTURED_FORMATS = {'jsonl': JsonLinesEncoder, 'csv': CsvEncoder}
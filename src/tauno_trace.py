@@ -0,0 +1,144 @@
+# File:    tauno_trace.py
+# Author:  Tauno Erik
+# Started: 18.10.2026
+# Edited:  18.10.2026
+# Leveled trace messages with category filter.
+#
+# Usage:
+#   trace = get_tracer('serial')
+#   trace.debug("read %d bytes", size)
+#
+# A disabled level is a call to an empty function: arguments are
+# not formatted, so use '%s' arguments, not f-strings, on hot paths.
+# Messages can also go to a ring buffer that is written out with dump().
+
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+# Levels (gschema trace-level)
+ERROR = 40
+WARNING = 30
+INFO = 20
+DEBUG = 10
+OFF = 100
+TRACE_LEVELS = {'off': OFF, 'error': ERROR, 'warning': WARNING, 'info': INFO, 'debug': DEBUG}
+LEVEL_NAMES = {ERROR: 'ERROR', WARNING: 'WARNING', INFO: 'INFO', DEBUG: 'DEBUG'}
+
+# Categories (gschema trace-categories, comma separated, empty = all)
+CATEGORIES = ['app', 'window', 'preferences', 'serial', 'rx', 'log',
+              'replay', 'viewer', 'usb', 'baud']
+
+# Messages at this level and above are printed
+output_level = WARNING
+# Categories shown, None = all
+enabled_categories = None
+# Ring buffer of (time, level, category, message, args), None = off
+ring = None
+ring_lock = threading.Lock()
+
+tracers = {}
+
+
+def no_trace(*args):
+    """ Disabled level """
+
+
+def emit(level, category, message, *args):
+    """ Enabled level: to ring buffer and/or output """
+    buffer = ring
+    if buffer is not None:
+        buffer.append((time.time(), level, category, message, args))
+    if level >= output_level:
+        print(f"{category}: {format_message(message, args)}", file=sys.stderr)
+
+
+def format_message(message, args):
+    if not args:
+        return str(message)
+    try:
+        return message % args
+    except (TypeError, ValueError):
+        return ' '.join([str(message)] + [str(arg) for arg in args])
+
+
+class Tracer():
+    """
+    Trace messages of one category.
+    Methods error(), warning(), info() and debug() are replaced with
+    no_trace when the level or category is turned off.
+    """
+
+    def __init__(self, category):
+        self.category = category
+        self.update()
+
+
+    def update(self):
+        """ Set level methods from current configuration """
+        category = self.category
+        shown = enabled_categories is None or category in enabled_categories
+        for name, level in (('error', ERROR), ('warning', WARNING),
+                            ('info', INFO), ('debug', DEBUG)):
+            if shown and (level >= output_level or ring is not None):
+                setattr(self, name, self.make_emit(level))
+            else:
+                setattr(self, name, no_trace)
+
+
+    def make_emit(self, level):
+        category = self.category
+        def trace_emit(message, *args):
+            emit(level, category, message, *args)
+        return trace_emit
+
+
+    def enabled(self, level):
+        """ For callers that build costly messages """
+        return getattr(self, LEVEL_NAMES[level].lower()) is not no_trace
+
+
+def get_tracer(category):
+    """ Tracer for category, one per category """
+    tracer = tracers.get(category)
+    if tracer is None:
+        tracer = tracers[category] = Tracer(category)
+    return tracer
+
+
+def configure(level='warning', categories='', ring_size=0):
+    """
+    level: name from TRACE_LEVELS
+    categories: comma separated names, empty = all
+    ring_size: messages kept for dump(), 0 = no ring buffer
+    """
+    global output_level, enabled_categories, ring
+    output_level = TRACE_LEVELS.get(level, WARNING)
+    names = [name.strip() for name in categories.split(',') if name.strip()]
+    enabled_categories = set(names) if names else None
+    with ring_lock:
+        if ring_size <= 0:
+            ring = None
+        elif ring is None or ring.maxlen != ring_size:
+            ring = deque(ring or (), maxlen=ring_size)
+    for tracer in tracers.values():
+        tracer.update()
+
+
+def configure_from_settings(settings):
+    """ Configure from Gio.Settings """
+    configure(settings.get_string("trace-level"),
+              settings.get_string("trace-categories"),
+              settings.get_int("trace-ring-size"))
+
+
+def dump(file_handle):
+    """ Write ring buffer to text file. Returns number of messages. """
+    with ring_lock:
+        entries = list(ring) if ring is not None else []
+    for wall_time, level, category, message, args in entries:
+        stamp = datetime.fromtimestamp(wall_time).strftime('%Y-%m-%d %H:%M:%S.%f')
+        file_handle.write(f"{stamp} {LEVEL_NAMES[level]} {category}: {format_message(message, args)}\n")
+    return len(entries)
@@ -0,0 +1,143 @@
+# File:    tauno_usb.py
+# Author:  Tauno Erik
+# Started: 18.10.2026
+# Edited:  18.10.2026
+# USB vendor and product names (http://www.linux-usb.org/usb.ids).
+# Names are read from a compact store (tauno_usb_ids.py) that is
+# mmapped, so it costs almost no memory and no parse time.
+#
+# The system usb.ids (hwdata) is used when there is one: it is parsed
+# once into a store in $XDG_CACHE_HOME/tauno-monitor, named by its path
+# and mtime, so an updated usb.ids is parsed again on next start.
+# Else usb-ids.bin, made by meson at build time, is used.
+# preload() opens the store in a background thread after the window
+# is shown, or lookup() opens it when it is needed first.
+
+import glob
+import hashlib
+import os
+import threading
+import time
+from .tauno_usb_ids import (UsbIdStore, UsbIdError, store_bytes, write_store,
+                            parse_usb_ids)
+from .tauno_trace import get_tracer
+
+trace = get_tracer('usb')
+
+STORE_PATH = os.path.join(os.path.dirname(__file__), 'usb-ids.bin')
+
+# First found is used
+SYSTEM_USB_IDS = ['/usr/share/hwdata/usb.ids', '/usr/share/misc/usb.ids']
+
+CACHE_PREFIX = 'usb-ids-'
+CACHE_SUFFIX = '.bin'
+
+# UsbIdStore, None = not loaded
+store = None
+load_lock = threading.Lock()
+
+
+def cache_dir():
+    """ $XDG_CACHE_HOME/tauno-monitor """
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+    return os.path.join(base, 'tauno-monitor')
+
+
+def cache_path(source_path):
+    """ Store file for source, a new name when source changes """
+    stat = os.stat(source_path)
+    key = f"{os.path.realpath(source_path)}:{stat.st_mtime_ns}:{stat.st_size}"
+    name = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(cache_dir(), CACHE_PREFIX + name + CACHE_SUFFIX)
+
+
+def remove_old_stores(keep_path):
+    """ Stores of older usb.ids files are not used again """
+    pattern = os.path.join(glob.escape(cache_dir()), CACHE_PREFIX + '*' + CACHE_SUFFIX)
+    for path in glob.glob(pattern):
+        if path != keep_path:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def open_system_store(source_path):
+    """ Cached store of a system usb.ids, parsed first if needed """
+    path = cache_path(source_path)
+    try:
+        return UsbIdStore.open(path)
+    except (OSError, UsbIdError):
+        pass
+
+    start = time.perf_counter()
+    with open(source_path, 'rb') as file_handle:
+        # Lines that are not valid are skipped
+        vendors, products = parse_usb_ids(file_handle.read(), strict=False)
+    trace.info("Parsed %s in %.0f ms", source_path, (time.perf_counter() - start) * 1000)
+    try:
+        os.makedirs(cache_dir(), exist_ok=True)
+        write_store(vendors, products, path)
+        remove_old_stores(path)
+        return UsbIdStore.open(path)
+    except (OSError, UsbIdError) as e:
+        # No cache: keep store in memory
+        trace.warning("USB ID cache: %s", e)
+        return UsbIdStore(store_bytes(vendors, products))
+
+
+def open_store():
+    """ System usb.ids, else store made at build time, else empty store """
+    for source_path in SYSTEM_USB_IDS:
+        if os.path.exists(source_path):
+            try:
+                return open_system_store(source_path)
+            except (OSError, UsbIdError) as e:
+                trace.warning("USB IDs %s: %s", source_path, e)
+    try:
+        return UsbIdStore.open(STORE_PATH)
+    except (OSError, UsbIdError) as e:
+        trace.warning("USB IDs: %s", e)
+        return UsbIdStore(store_bytes({}, {}))
+
+
+def load():
+    """ Open store once, thread safe """
+    global store
+    with load_lock:
+        if store is None:
+            start = time.perf_counter()
+            store = open_store()
+            trace.debug("USB IDs loaded in %.1f ms", (time.perf_counter() - start) * 1000)
+    return store
+
+
+def is_loaded():
+    return store is not None
+
+
+def preload(on_loaded=None):
+    """
+    Load in background thread, then call on_loaded() in that thread.
+    Returns False for GLib.idle_add.
+    """
+    def run():
+        load()
+        if on_loaded is not None:
+            on_loaded()
+    threading.Thread(target=run, daemon=True).start()
+    return False
+
+
+def lookup(vid, pid):
+    """
+    vid, pid: 4 digit hex strings
+    Returns (vendor name, product name), None if not known.
+    """
+    try:
+        vid_number = int(vid, 16)
+        pid_number = int(pid, 16)
+    except ValueError:
+        return None, None
+    usb_ids = load()
+    return usb_ids.vendor(vid_number), usb_ids.product(vid_number, pid_number)
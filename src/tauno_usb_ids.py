@@ -0,0 +1,249 @@
+# File:    tauno_usb_ids.py
+# Author:  Tauno Erik
+# Started: 18.10.2026
+# Edited:  18.10.2026
+# Compact USB ID store: vendor and product names in sorted arrays,
+# read with mmap and bisect. No dicts are made, a lookup reads only
+# a few pages of the file.
+#
+# File layout (little endian):
+#   Header:   magic b'TMUSB\0', version u16, vendor count u32, product count u32
+#   Vendors:  vendor ids u32[vendor count], name offsets u32[vendor count]
+#   Products: keys u32[product count] (vid << 16 | pid),
+#             name offsets u32[product count]
+#   Strings:  UTF-8 names, each ends with a zero byte
+#
+# Uses only the standard library, so meson runs it at build time:
+#   python3 tauno_usb_ids.py usb.ids usb-ids.bin
+# usb.ids: http://www.linux-usb.org/usb-ids.html
+
+import mmap
+import os
+import re
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+
+STORE_MAGIC = b'TMUSB\0'
+STORE_VERSION = 1
+
+HEADER = struct.Struct('<6sHII')
+
+
+# Errors shown when usb.ids is not valid
+MAX_ERRORS = 20
+
+VENDOR_LINE = re.compile(rb'([0-9a-fA-F]{4}) +(\S.*)')
+PRODUCT_LINE = re.compile(rb'\t([0-9a-fA-F]{4}) +(\S.*)')
+# Device classes, languages, ... come after the vendor list
+SECTION_LINE = re.compile(rb'[A-Z]+ ')
+
+
+class UsbIdError(Exception):
+    """ File is not a USB ID store, or usb.ids is not valid """
+
+
+def product_key(vid, pid):
+    return vid << 16 | pid
+
+
+def parse_usb_ids(data, strict=True):
+    """
+    Vendor and product tables from usb.ids content (bytes), in one pass.
+    Returns (vendors, products) for store_bytes().
+    strict: raise UsbIdError for lines that are not valid,
+            else they are skipped.
+    """
+    vendors = {}
+    products = {}
+    errors = []
+    vid = None
+    vendor_match = VENDOR_LINE.fullmatch
+    product_match = PRODUCT_LINE.fullmatch
+    for number, line in enumerate(data.split(b'\n'), 1):
+        line = line.rstrip()
+        if not line or line.startswith(b'#') or line.startswith(b'\t\t'):
+            # Comments and interfaces
+            continue
+        error = None
+        match = product_match(line)
+        if match is not None:
+            if vid is None:
+                error = "product without vendor"
+            else:
+                key = product_key(vid, int(match.group(1), 16))
+                if key in products:
+                    error = f"product {match.group(1).decode()} again"
+                else:
+                    try:
+                        products[key] = match.group(2).decode('utf-8')
+                    except UnicodeDecodeError:
+                        error = "name is not UTF-8"
+        else:
+            match = vendor_match(line)
+            if match is not None:
+                vid = int(match.group(1), 16)
+                if vid in vendors:
+                    error = f"vendor {match.group(1).decode()} again"
+                else:
+                    try:
+                        vendors[vid] = match.group(2).decode('utf-8')
+                    except UnicodeDecodeError:
+                        error = "name is not UTF-8"
+            elif SECTION_LINE.match(line):
+                break
+            else:
+                error = "not a vendor or product line"
+        if error is not None:
+            errors.append(f"line {number}: {error}")
+
+    if not vendors:
+        raise UsbIdError("no vendors found")
+    if errors and strict:
+        raise UsbIdError('\n'.join(errors[:MAX_ERRORS]))
+    return vendors, products
+
+
+def store_bytes(vendors, products):
+    """
+    vendors: {vid: name}, products: {product_key(vid, pid): name}
+    Returns store file content.
+    """
+    strings = bytearray()
+    string_offsets = {}
+
+    def add_string(name):
+        # Same name is stored once
+        offset = string_offsets.get(name)
+        if offset is None:
+            offset = string_offsets[name] = len(strings)
+            strings.extend(name.encode('utf-8'))
+            strings.append(0)
+        return offset
+
+    parts = [HEADER.pack(STORE_MAGIC, STORE_VERSION, len(vendors), len(products))]
+    for table in (vendors, products):
+        keys = sorted(table)
+        parts.append(struct.pack(f'<{len(keys)}I', *keys))
+        parts.append(struct.pack(f'<{len(keys)}I', *[add_string(table[key]) for key in keys]))
+    parts.append(bytes(strings))
+    return b''.join(parts)
+
+
+def write_store(vendors, products, file_path):
+    """ Write store file, replaced in one step so readers never see half a file """
+    temp_path = f"{file_path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, 'wb') as file_handle:
+            file_handle.write(store_bytes(vendors, products))
+        os.replace(temp_path, file_path)
+    except OSError:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+class UsbIdStore():
+    """
+    Vendor and product names from store data (mmap or bytes).
+    Use UsbIdStore.open(path) for a file.
+    """
+
+    def __init__(self, data, file_handle=None):
+        self.data = data
+        self.file_handle = file_handle
+        if len(data) < HEADER.size:
+            raise UsbIdError("USB ID store header is missing")
+        magic, version, vendor_count, product_count = HEADER.unpack_from(data, 0)
+        if magic != STORE_MAGIC or version != STORE_VERSION:
+            raise UsbIdError("Not a USB ID store")
+
+        offset = HEADER.size
+        tables = []
+        for count in (vendor_count, vendor_count, product_count, product_count):
+            end = offset + count * 4
+            if end > len(data):
+                raise UsbIdError("USB ID store is cut short")
+            tables.append(self.u32_array(data, offset, end))
+            offset = end
+        self.vendor_ids, self.vendor_names, self.product_keys, self.product_names = tables
+        self.strings = offset
+
+
+    @classmethod
+    def open(cls, file_path):
+        file_handle = open(file_path, 'rb')
+        try:
+            data = mmap.mmap(file_handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty file
+            file_handle.close()
+            raise UsbIdError("Empty USB ID store")
+        try:
+            return cls(data, file_handle)
+        except UsbIdError:
+            data.close()
+            file_handle.close()
+            raise
+
+
+    @staticmethod
+    def u32_array(data, start, end):
+        """ u32 table as a sequence for bisect, without copying if possible """
+        view = memoryview(data)[start:end]
+        if sys.byteorder == 'little':
+            return view.cast('I')
+        table = array('I', view)
+        table.byteswap()
+        return table
+
+
+    def close(self):
+        # Views must be released before mmap is closed
+        for table in (self.vendor_ids, self.vendor_names,
+                      self.product_keys, self.product_names):
+            if isinstance(table, memoryview):
+                table.release()
+        if self.file_handle is not None:
+            self.data.close()
+            self.file_handle.close()
+
+
+    def name_at(self, names, keys, key):
+        i = bisect_left(keys, key)
+        if i == len(keys) or keys[i] != key:
+            return None
+        start = self.strings + names[i]
+        end = self.data.find(b'\0', start)
+        return self.data[start:end].decode('utf-8', 'replace')
+
+
+    def vendor(self, vid):
+        """ Vendor name, None if not known. vid: int """
+        return self.name_at(self.vendor_names, self.vendor_ids, vid)
+
+
+    def product(self, vid, pid):
+        """ Product name, None if not known. vid, pid: int """
+        return self.name_at(self.product_names, self.product_keys, product_key(vid, pid))
+
+
+def main(argv):
+    """ Build step: usb.ids to store file """
+    if len(argv) != 3:
+        print(f"Usage: {argv[0]} usb.ids usb-ids.bin", file=sys.stderr)
+        return 2
+    try:
+        with open(argv[1], 'rb') as file_handle:
+            vendors, products = parse_usb_ids(file_handle.read())
+        write_store(vendors, products, argv[2])
+    except (OSError, UsbIdError) as e:
+        print(f"{argv[1]}: {e}", file=sys.stderr)
+        return 1
+    print(f"{argv[2]}: {len(vendors)} vendors, {len(products)} products")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
@@ -0,0 +1,341 @@
+# File:    tauno_view_source.py
+# Author:  Tauno Erik
+# Started: 18.10.2026
+# Edited:  18.10.2026
+# Rows of a text log or capture file for the log viewer (viewer.py).
+# Files are mmapped, a row is read only when it is shown.
+# A background scan keeps a small table of row positions,
+# so any row is found without reading the file from the start.
+
+import mmap
+import os
+import re
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from .tauno_capture import (CaptureReader, HEADER as CAPTURE_HEADER,
+                            RECORD as CAPTURE_RECORD, PORT_NAME, CAPTURE_MAGIC)
+from .tauno_format import format_bytes
+from .tauno_index import LogIndex, KIND_CAPTURE
+from .tauno_trace import get_tracer
+
+trace = get_tracer('viewer')
+
+# Row views
+VIEW_MODES = ['ASCII', 'HEX']
+
+# Text log is scanned in chunks of this size
+CHUNK_SIZE = 64 * 1024
+# Chunks with line positions kept in memory
+CHUNK_CACHE_SIZE = 32
+# Longest row shown, longer lines are cut
+MAX_ROW_BYTES = 4096
+# Capture: one table entry every RECORD_STEP records
+RECORD_STEP = 256
+
+# Line timestamps: JSON Lines and CSV (ISO 8601), text log (time of day)
+ISO_TIME_PATTERN = re.compile(rb'(?:\{"time":")?(\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d\.\d{6}[+-]\d\d:\d\d)')
+DAY_TIME_PATTERN = re.compile(rb'(\d\d):(\d\d):(\d\d)\.(\d{6}) ')
+HALF_DAY = timedelta(hours=12)
+
+
+def line_time(data, near):
+    """
+    time.time() of a log line, None if line has no timestamp.
+    near: datetime close to the line time, gives the date of
+    text log lines that only have time of day.
+    """
+    match = ISO_TIME_PATTERN.match(data)
+    if match:
+        return datetime.fromisoformat(match.group(1).decode('ascii')).timestamp()
+    match = DAY_TIME_PATTERN.match(data)
+    if match is None:
+        return None
+    hour, minute, second, micro = (int(group) for group in match.groups())
+    if hour > 23 or minute > 59 or second > 59:
+        return None
+    stamp = near.replace(hour=hour, minute=minute, second=second, microsecond=micro)
+    # Line is from the day before or after
+    if stamp < near - HALF_DAY:
+        stamp += timedelta(days=1)
+    elif stamp > near + HALF_DAY:
+        stamp -= timedelta(days=1)
+    return stamp.timestamp()
+
+
+def open_source(file_path):
+    """ TextSource or CaptureSource by file content """
+    with open(file_path, 'rb') as file_handle:
+        magic = file_handle.read(len(CAPTURE_MAGIC))
+    if magic == CAPTURE_MAGIC:
+        return CaptureSource(file_path)
+    return TextSource(file_path)
+
+
+class ViewSource():
+    """
+    Base for file row sources.
+    rows grows while scan() runs in a background thread.
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.rows = 0
+        self.done = False
+        self.stop_event = threading.Event()
+        self.thread = None
+
+
+    def start(self):
+        """ Start background scan """
+        self.thread = threading.Thread(target=self.run)
+        self.thread.daemon = True
+        self.thread.start()
+
+
+    def run(self):
+        try:
+            self.scan()
+        except (OSError, ValueError) as e:
+            trace.error("Viewer scan error: %s", e)
+        self.done = True
+
+
+    def close(self):
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+
+
+class TextSource(ViewSource):
+    """ Text log, one row per line """
+
+    def __init__(self, file_path):
+        super().__init__(file_path)
+        self.file_handle = open(file_path, 'rb')
+        self.size = os.fstat(self.file_handle.fileno()).st_size
+        self.map = None
+        if self.size:
+            self.map = mmap.mmap(self.file_handle.fileno(), 0, access=mmap.ACCESS_READ)
+        # Newlines before the start of each chunk
+        self.chunk_lines = [0]
+        # chunk number: line start positions in chunk
+        self.chunk_cache = {}
+        self.index = LogIndex.for_log(file_path)
+
+
+    def scan(self):
+        """ Count lines chunk by chunk """
+        data = self.map
+        size = self.size
+        lines = 0
+        position = 0
+        while position < size:
+            if self.stop_event.is_set():
+                return
+            end = min(position + CHUNK_SIZE, size)
+            lines += data[position:end].count(b'\n')
+            position = end
+            self.chunk_lines.append(lines)
+            self.rows = lines
+        # Last line without newline
+        if size and data[size - 1] != 0x0A:
+            self.rows = lines + 1
+
+
+    def close(self):
+        super().close()
+        if self.map is not None:
+            self.map.close()
+        self.file_handle.close()
+
+
+    def chunk_starts(self, chunk):
+        """ Positions after every newline in chunk """
+        starts = self.chunk_cache.get(chunk)
+        if starts is None:
+            if len(self.chunk_cache) >= CHUNK_CACHE_SIZE:
+                self.chunk_cache.pop(next(iter(self.chunk_cache)))
+            start = chunk * CHUNK_SIZE
+            end = min(start + CHUNK_SIZE, self.size)
+            find = self.map.find
+            starts = []
+            position = find(b'\n', start, end)
+            while position >= 0:
+                starts.append(position + 1)
+                position = find(b'\n', position + 1, end)
+            self.chunk_cache[chunk] = starts
+        return starts
+
+
+    def row_start(self, row):
+        """ File offset of line row """
+        if row == 0:
+            return 0
+        # Chunk that has newline number row
+        chunk = bisect_left(self.chunk_lines, row) - 1
+        return self.chunk_starts(chunk)[row - self.chunk_lines[chunk] - 1]
+
+
+    def row_data(self, row):
+        """ Bytes of line row, without line end """
+        start = self.row_start(row)
+        limit = min(start + MAX_ROW_BYTES, self.size)
+        end = self.map.find(b'\n', start, limit)
+        if end < 0:
+            end = limit
+        return self.map[start:end].rstrip(b'\r')
+
+
+    def row_text(self, row, mode):
+        data = self.row_data(row)
+        if mode == 'HEX':
+            return format_bytes(data, 'HEX')
+        return data.decode('utf-8', 'replace')
+
+
+    def row_label(self, row):
+        return str(row + 1)
+
+
+    def find_row(self, wall_time):
+        """
+        First line stamped at or after time.time() value, needs
+        sidecar index. Lines from the index entry before the time
+        are read up to the next entry.
+        """
+        index = self.index
+        if index is None:
+            return None
+        i = bisect_right(index.times, int(wall_time * 1e9)) - 1
+        if i < 0:
+            row = 0
+            near = datetime.fromtimestamp(wall_time)
+        else:
+            row = index.numbers[i]
+            near = datetime.fromtimestamp(index.times[i] / 1e9)
+        # Next entry is after the time
+        if i + 1 < len(index):
+            end = min(index.numbers[i + 1], self.rows)
+        else:
+            end = self.rows
+        # Line times are cut to microseconds
+        target = wall_time - 1e-6
+        while row < end:
+            stamp = line_time(self.row_data(row), near)
+            if stamp is not None and stamp >= target:
+                return row
+            row += 1
+        return end if end < self.rows else None
+
+
+    def start_time(self):
+        """ time.time() of first index entry, None without index """
+        if self.index is None or not len(self.index):
+            return None
+        return self.index.times[0] / 1e9
+
+
+class CaptureSource(ViewSource):
+    """ Capture file, one row per record """
+
+    def __init__(self, file_path):
+        super().__init__(file_path)
+        self.reader = CaptureReader(file_path)
+        # Record number and offset for every RECORD_STEP records
+        self.numbers = [0]
+        self.offsets = [CAPTURE_HEADER.size]
+        # Last row found, for scrolling row by row
+        self.last = (0, CAPTURE_HEADER.size)
+        self.index = LogIndex.for_log(file_path)
+        if self.index is not None and self.index.kind != KIND_CAPTURE:
+            self.index = None
+
+
+    def scan(self):
+        """ Walk record headers, port names are read on the way """
+        data = self.reader.map
+        size = len(data)
+        unpack_from = CAPTURE_RECORD.unpack_from
+        record_size = CAPTURE_RECORD.size
+        ports = self.reader.ports
+        count = 0
+        offset = CAPTURE_HEADER.size
+        while offset + record_size <= size:
+            length, mono_ns, code, port_id, checksum = unpack_from(data, offset)
+            end = offset + record_size + length
+            if end > size:
+                break
+            if code == PORT_NAME:
+                ports[port_id] = data[offset + record_size:end].decode('utf-8', 'replace')
+            count += 1
+            offset = end
+            if count % RECORD_STEP == 0:
+                # Offset first: numbers is searched without a lock
+                self.offsets.append(offset)
+                self.numbers.append(count)
+                self.rows = count
+                if self.stop_event.is_set():
+                    return
+        self.rows = count
+
+
+    def close(self):
+        super().close()
+        self.reader.close()
+
+
+    def row_offset(self, row):
+        """ File offset of record row """
+        i = bisect_right(self.numbers, row) - 1
+        number, offset = self.numbers[i], self.offsets[i]
+        last_number, last_offset = self.last
+        if number <= last_number <= row:
+            number, offset = last_number, last_offset
+        data = self.reader.map
+        unpack_from = CAPTURE_RECORD.unpack_from
+        record_size = CAPTURE_RECORD.size
+        while number < row:
+            offset += record_size + unpack_from(data, offset)[0]
+            number += 1
+        self.last = (row, offset)
+        return offset
+
+
+    def row_text(self, row, mode):
+        record = self.reader.record_at(self.row_offset(row))
+        if record is None:
+            return ''
+        data = record.data[:MAX_ROW_BYTES]
+        if record.direction == PORT_NAME:
+            return f"port {record.port} = {data.decode('utf-8', 'replace')}"
+        if mode == 'HEX':
+            text = format_bytes(data, 'HEX')
+        else:
+            text = data.decode('utf-8', 'backslashreplace')
+            text = text.replace('\r', '\\r').replace('\n', '\\n')
+        wall = datetime.fromtimestamp(self.reader.wall_time(record.mono_ns))
+        return f"{wall.strftime('%H:%M:%S.%f')} {record.direction} {record.port}: {text}"
+
+
+    def row_label(self, row):
+        return str(row + 1)
+
+
+    def find_row(self, wall_time):
+        """ First record at or after time.time() value """
+        reader = self.reader
+        mono_ns = reader.start_mono_ns + int(wall_time * 1e9) - reader.start_wall_ns
+        if self.index is not None:
+            offset, number = self.index.find_time(mono_ns)
+        else:
+            offset, number = CAPTURE_HEADER.size, 0
+        for record in reader.records(offset, port_names=True):
+            if record.mono_ns >= mono_ns:
+                return number
+            number += 1
+        return None
+
+
+    def start_time(self):
+        return self.reader.start_wall_ns / 1e9
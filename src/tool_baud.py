@@ -12,6 +12,9 @@ import gettext
 _ = gettext.gettext
 import locale
 import os
+from .tauno_trace import get_tracer
+
+trace = get_tracer('baud')
 
 @Gtk.Template(resource_path='/art/taunoerik/tauno-monitor/tool_baud.ui')
 class TaunoToolBaudWindow(Adw.Window):
@@ -28,7 +31,7 @@ class TaunoToolBaudWindow(Adw.Window):
         self.window_reference = window_reference
 
         self.port = self.window_reference.settings.get_string("port-str")
-        print(f"todo {self.port}")
+        trace.debug("todo %s", self.port)
 
         self.event = threading.Event()
 
@@ -70,11 +73,11 @@ class TaunoToolBaudWindow(Adw.Window):
         best = max(self.scores, key=lambda x: x[0])
         score, baud, lines = best
         self.message_label.set_label(_(f"Best match: {baud} baud"))
-        print("\nBest match:")
-        print(f"{baud} with {score} valid lines")
+        trace.info("\nBest match:")
+        trace.info("%s with %s valid lines", baud, score)
         # Print valid lines
         for line in lines:
-            print(f"  {line.decode('utf-8', errors='ignore').strip()}")
+            trace.debug("  %s", line.decode('utf-8', errors='ignore').strip())
 
         self.best_baud = baud
         #Enable Scan button
@@ -87,7 +90,7 @@ class TaunoToolBaudWindow(Adw.Window):
 
     def try_baud_rate(self, port, baudrate, timeout=2.0):
         GLib.idle_add(self.message_label.set_label, _(f"Trying {baudrate} baud..."))
-        print(f"Trying {baudrate} baud...")
+        trace.debug("Trying %s baud...", baudrate)
 
         try:
             with serial.Serial(port, baudrate, timeout=timeout) as ser:
@@ -103,7 +106,7 @@ class TaunoToolBaudWindow(Adw.Window):
                         buffer += chunk
                         while b'\n' in buffer:
                             line, buffer = buffer.split(b'\n', 1)
-                            print(f"line: {line}")
+                            trace.debug("line: %s", line)
                             line = line.strip(b'\r')
                             if line:
                                 if line.isascii():
@@ -115,7 +118,7 @@ class TaunoToolBaudWindow(Adw.Window):
                 #return score, good_lines[:5]  # return a few examples too
                 self.scores.append((score, baudrate, good_lines[:5]))
         except Exception as e:
-            print(f"Error at {baudrate} baud: {e}")
+            trace.error("Error at %s baud: %s", baudrate, e)
             self.message_label.set_label(_(f"Connect the device to the port!"))
             #return 0, []
             self.scores.append((0, baudrate, []))
@@ -124,7 +127,7 @@ class TaunoToolBaudWindow(Adw.Window):
 
     @Gtk.Template.Callback()
     def on_set_baud_rate(self, buttom):
-        print("on_set_baud_rate")
+        trace.debug("on_set_baud_rate")
 
         if self.best_baud in self.window_reference.COMMON_BAUD_RATES:
             pos = self.window_reference.COMMON_BAUD_RATES.index(self.best_baud)
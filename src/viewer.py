@@ -0,0 +1,180 @@
+# File:    viewer.py
+# Author:  Tauno Erik
+# Started: 18.10.2026
+# Edited:  18.10.2026
+# Log and capture viewer window.
+# Gtk.ListView makes widgets only for visible rows,
+# row text is read from the mmapped file when a row is shown.
+
+from gi.repository import Adw, Gtk, Gio, GObject, GLib
+from datetime import datetime
+import os
+import re
+from .tauno_view_source import VIEW_MODES
+
+# How often (ms) rows found by the background scan are added
+SCAN_UPDATE_MS = 200
+
+TIME_PATTERN = re.compile(r'^(\d{1,2}):(\d{2}):(\d{2})(?:\.(\d{1,6}))?$')
+
+
+class ViewerRow(GObject.Object):
+    """ List item: only the row number, text is made when shown """
+    __gtype_name__ = 'TaunoViewerRow'
+
+    def __init__(self, row):
+        super().__init__()
+        self.row = row
+
+
+class ViewerModel(GObject.Object, Gio.ListModel):
+    """ Gio.ListModel over ViewSource rows (tauno_view_source.py) """
+    __gtype_name__ = 'TaunoViewerModel'
+
+    def __init__(self, source):
+        super().__init__()
+        self.source = source
+        self.n_items = 0
+
+
+    def do_get_item_type(self):
+        return ViewerRow.__gtype__
+
+
+    def do_get_n_items(self):
+        return self.n_items
+
+
+    def do_get_item(self, position):
+        if position >= self.n_items:
+            return None
+        return ViewerRow(position)
+
+
+    def update(self):
+        """ Add rows found by background scan """
+        rows = self.source.rows
+        if rows > self.n_items:
+            old = self.n_items
+            self.n_items = rows
+            self.items_changed(old, 0, rows - old)
+
+
+    def refresh(self):
+        """ Make visible rows again, e.g. after view mode change """
+        self.items_changed(0, self.n_items, self.n_items)
+
+
+@Gtk.Template(resource_path='/art/taunoerik/tauno-monitor/viewer.ui')
+class TaunoViewerWindow(Adw.Window):
+    __gtype_name__ = 'TaunoViewerWindow'
+
+    list_view = Gtk.Template.Child()
+    view_mode_dropdown = Gtk.Template.Child()
+    go_to_entry = Gtk.Template.Child()
+    status_label = Gtk.Template.Child()
+
+    def __init__(self, source, **kwargs):
+        super().__init__(**kwargs)
+
+        self.source = source
+        self.mode = VIEW_MODES[0]
+        self.set_title(os.path.basename(source.file_path))
+
+        self.model = ViewerModel(source)
+        factory = Gtk.SignalListItemFactory()
+        factory.connect('setup', self.on_row_setup)
+        factory.connect('bind', self.on_row_bind)
+        self.list_view.set_model(Gtk.NoSelection.new(self.model))
+        self.list_view.set_factory(factory)
+
+        self.connect('close-request', self.on_close_request)
+
+        self.source.start()
+        self.scan_timer = GLib.timeout_add(SCAN_UPDATE_MS, self.on_scan_update)
+
+
+    def on_row_setup(self, factory, list_item):
+        box = Gtk.Box(spacing=12)
+        number_label = Gtk.Label(xalign=1, width_chars=9)
+        number_label.add_css_class('dim-label')
+        text_label = Gtk.Label(xalign=0, hexpand=True)
+        box.append(number_label)
+        box.append(text_label)
+        list_item.set_child(box)
+
+
+    def on_row_bind(self, factory, list_item):
+        """ Row text is read from file here, only for visible rows """
+        row = list_item.get_item().row
+        box = list_item.get_child()
+        number_label = box.get_first_child()
+        text_label = number_label.get_next_sibling()
+        number_label.set_text(self.source.row_label(row))
+        text_label.set_text(self.source.row_text(row, self.mode))
+
+
+    def on_scan_update(self):
+        self.model.update()
+        if self.source.done:
+            self.status_label.set_label(f"{self.model.n_items} rows")
+            self.scan_timer = None
+            return GLib.SOURCE_REMOVE
+        self.status_label.set_label(f"{self.model.n_items} rows, reading...")
+        return GLib.SOURCE_CONTINUE
+
+
+    @Gtk.Template.Callback()
+    def on_view_mode_changed(self, drop_down, _gparam):
+        self.mode = VIEW_MODES[drop_down.get_selected()]
+        self.model.refresh()
+
+
+    @Gtk.Template.Callback()
+    def on_go_to(self, entry):
+        """ Scroll to line number or time HH:MM:SS """
+        text = entry.get_text().strip()
+        row = None
+        if text.isdigit():
+            row = int(text) - 1
+        else:
+            match = TIME_PATTERN.match(text)
+            if match is None:
+                self.status_label.set_label("Enter line number or HH:MM:SS")
+                return
+            row = self.find_time_row(match)
+            if row is None:
+                self.status_label.set_label("Time not found (text logs need an index file)")
+                return
+
+        if self.model.n_items == 0:
+            return
+        row = max(0, min(row, self.model.n_items - 1))
+        self.list_view.scroll_to(row, Gtk.ListScrollFlags.NONE, None)
+
+
+    def find_time_row(self, match):
+        """ Row for HH:MM:SS on the day the file was started """
+        start = self.source.start_time()
+        if start is None:
+            return None
+        hour, minute, second, fraction = match.groups()
+        day = datetime.fromtimestamp(start)
+        try:
+            wanted = day.replace(hour=int(hour), minute=int(minute), second=int(second),
+                                 microsecond=int((fraction or '0').ljust(6, '0')))
+        except ValueError:
+            return None
+        wall_time = wanted.timestamp()
+        # Log went over midnight
+        if wall_time < start - 1:
+            wall_time += 24 * 60 * 60
+        return self.source.find_row(wall_time)
+
+
+    def on_close_request(self, window):
+        if self.scan_timer is not None:
+            GLib.source_remove(self.scan_timer)
+            self.scan_timer = None
+        self.source.close()
+        return False
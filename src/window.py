@@ -28,15 +28,37 @@ import codecs
 import time
 from .tauno_serial import TaunoSerial
 from .tauno_logging import TaunoLogging
+from .tauno_capture import CAPTURE_EXTENSION
+from .tauno_structured import STRUCTURED_FORMATS
+from .tauno_replay import CaptureReplay
+from .tauno_view_source import open_source
+from .tauno_capture import CaptureError
+from .viewer import TaunoViewerWindow
+from .tauno_rx_queue import RxQueue
+from .tauno_composer import LineComposer
+from .tauno_config import DisplayConfig, TX_LINE_END_NAMES, RX_LINE_END_NAMES
+from .tauno_format import BYTE_FORMATS, format_bytes
 from .guide import TaunoGuideWindow
 from .tool_baud import TaunoToolBaudWindow
 import gettext, locale, os, random, string
 import re
-from .usb_db import usb_db
+from . import tauno_usb
+from .tauno_hotplug import PortMonitor, port_info, ADD, REMOVE, RESCAN
+from .tauno_trace import get_tracer
+from . import tauno_trace
+
+trace = get_tracer('window')
 
 APP_NAME = "Tauno Monitor"
 APP_ID = "art.taunoerik.tauno-monitor"
 
+# Trim Text View when it is 10% over the scrollback limit
+SCROLLBACK_SLACK = 0.1
+
+# Drain RX queue with a timer (ms) when frame clock ticks do not come,
+# e.g. window is minimized
+RX_FALLBACK_MS = 100
+
 @Gtk.Template(resource_path='/art/taunoerik/tauno-monitor/window.ui')
 class TaunoMonitorWindow(Adw.ApplicationWindow):
     __gtype_name__ = 'TaunoMonitorWindow'
@@ -72,6 +94,8 @@ class TaunoMonitorWindow(Adw.ApplicationWindow):
     info_Manufacturer = Gtk.Template.Child()
     info_Product = Gtk.Template.Child()
     info_Interface = Gtk.Template.Child()
+    info_rx_dropped = Gtk.Template.Child()
+    info_rx_high_water = Gtk.Template.Child()
 
     split_view = Gtk.Template.Child()
 
@@ -115,13 +139,24 @@ class TaunoMonitorWindow(Adw.ApplicationWindow):
         self.info_baud_value.set_label(selected_str)
         self.baud_drop_down.connect("notify::selected-item", self.on_baud_drop_down_changed)
 
+        # USB vendor and product names (tauno_usb.py), loaded after window is shown.
+        # Set before load_saved_port(), it shows names of the saved port.
+        self.usb_ids = None
+
         self.ports_str_list = []
         self.load_saved_port()
         self.port_drop_down.connect("notify::selected-item", self.on_port_drop_down_changed)
 
+        # Ports list follows plugged and unplugged devices (tauno_hotplug.py)
+        # Selected port that was unplugged: it stays in the list,
+        # so selection (and port to reconnect) does not change
+        self.unplugged_port = None
+        self.port_monitor = PortMonitor(self.on_port_hotplug)
+        self.port_monitor.start()
+
 
-        self.serial_tx_line_endings = ['\\n', '\\r', '\\r\\n', 'None']
-        self.serial_rx_line_endings = ['\\n', '\\r', '\\r\\n', ';', 'None']
+        self.serial_tx_line_endings = TX_LINE_END_NAMES
+        self.serial_rx_line_endings = RX_LINE_END_NAMES
         ####
         tx_end_model = Gtk.StringList.new(self.serial_tx_line_endings)
         self.ui_tx_end.set_model(tx_end_model)
@@ -180,21 +215,44 @@ class TaunoMonitorWindow(Adw.ApplicationWindow):
         # Switch log
         self.create_action('log', self.on_btn_log)
 
+        # Menu Button Replay Capture
+        self.create_action('replay', self.on_btn_replay)
+
+        # Menu Button Open Log
+        self.create_action('viewer', self.on_btn_viewer)
+
+        # Menu Button Dump Trace
+        self.create_action('trace_dump', self.on_btn_trace_dump)
+
         # Entry
         self.send_cmd_entry.connect('activate', self.on_key_enter_pressed)
 
         self.write_logs = False
         self.log_file_exist = False #
 
+        # Received data: filled by serial thread, emptied on frame clock tick
+        self.rx_queue = RxQueue(on_ready=self.on_rx_queue_ready)
+        self.rx_tick_id = None
+        self.rx_fallback_id = None
+        self.rx_last_tick = 0
+        self.rx_queue_stats_shown = (0, 0)
+
+        # Settings used on every line, updated when settings change
+        self.display_config = DisplayConfig.from_settings(self.settings)
+        self.settings.connect("changed", self.on_display_settings_changed)
+
         # Get Serial instance, open later
         self.tauno_serial = TaunoSerial(window_reference=self)
+        # Capture file replay (tauno_replay.py)
+        self.replay = None
 
         self.logging = TaunoLogging(window_reference=self)
 
+        GLib.idle_add(tauno_usb.preload, self.on_usb_ids_loaded)
+
         # TextView Buffer
         self.text_buffer = self.input_text_view.get_buffer()
-        self.text_iter_end = self.text_buffer.get_end_iter()
-        self.text_mark_end = self.text_buffer.create_mark("", self.text_iter_end, False)
+        self.text_mark_end = self.text_buffer.create_mark("", self.text_buffer.get_end_iter(), False)
 
         # Tags
         # https://pygobject.gnome.org/tutorials/gtk4/textview.html
@@ -217,6 +275,14 @@ class TaunoMonitorWindow(Adw.ApplicationWindow):
 
         self.prev_char = '\n'  # store prev char
 
+        # Scrollback limit
+        self.scrollback_lines = self.settings.get_int("scrollback-lines")
+        self.scrollback_size = self.settings.get_int("scrollback-size")
+        self.settings.connect("changed::scrollback-lines", self.on_scrollback_changed)
+        self.settings.connect("changed::scrollback-size", self.on_scrollback_changed)
+        self.settings.connect("changed::rx-queue-size", self.on_rx_queue_settings_changed)
+        self.settings.connect("changed::rx-queue-overflow", self.on_rx_queue_settings_changed)
+
 
         # Reconnect
         self.reconnecting_serial = False
@@ -242,11 +308,11 @@ class TaunoMonitorWindow(Adw.ApplicationWindow):
         UP and DOWN arrow keys for TX history
         """
         if keyval == Gdk.KEY_Up:
-            print("up")
+            trace.debug("up")
             self.navigate_cmd_history(-1)
             return True
         elif keyval == Gdk.KEY_Down:
-            print("down")
+            trace.debug("down")
             self.navigate_cmd_history(1)
             return True
         return False
@@ -286,7 +352,8 @@ class TaunoMonitorWindow(Adw.ApplicationWindow):
 
 
     def on_close_request(self, window):
-        print("Window is being closed")
+        trace.debug("Window is being closed")
+        self.port_monitor.stop()
         if self.log_file_exist:
                 self.logging.close_file()
         return False  # allow closing
@@ -389,6 +456,7 @@ class TaunoMonitorWindow(Adw.ApplicationWindow):
     def scan_serial_ports(self):
         """ Scans available serial ports and adds them to drop down list"""
         old_size = len(self.port_drop_down_list)
+        self.unplugged_port = None
 
         try:
             all_ports = list(serial.tools.list_ports.comports())
@@ -411,14 +479,57 @@ class TaunoMonitorWindow(Adw.ApplicationWindow):
 
             self.port_drop_down_list.splice(0, old_size, self.ports_str_list)
         except Exception as e:
-            print("Scan serial ports error: ", e)
-            return
+            trace.error("Scan serial ports error: %s", e)
+        return GLib.SOURCE_REMOVE
+
+
+    def on_port_hotplug(self, action, device):
+        """ Called from port monitor thread """
+        if action == ADD:
+            # sysfs is read here, not in GTK thread
+            if port_info(device) is not None:
+                GLib.idle_add(self.add_port, device)
+        elif action == REMOVE:
+            GLib.idle_add(self.remove_port, device)
+        elif action == RESCAN:
+            GLib.idle_add(self.scan_serial_ports)
+
+
+    def add_port(self, device):
+        """ Add plugged in port to drop down list """
+        if device == self.unplugged_port:
+            # Selected port is back
+            self.unplugged_port = None
+            self.info_port_value.set_label(device)
+        elif device not in self.ports_str_list:
+            self.ports_str_list.append(device)
+            self.port_drop_down_list.append(device)
+            self.banner_no_ports.set_revealed(revealed=False)
+        return GLib.SOURCE_REMOVE
+
+
+    def remove_port(self, device):
+        """
+        Remove unplugged port from drop down list.
+        Selected port is only marked unplugged: open port reconnects to it.
+        """
+        if device in self.ports_str_list:
+            index = self.ports_str_list.index(device)
+            if index == self.port_drop_down.get_selected():
+                self.unplugged_port = device
+                self.info_port_value.set_label(device + " (unplugged)")
+                return GLib.SOURCE_REMOVE
+            del self.ports_str_list[index]
+            self.port_drop_down_list.remove(index)
+            if not self.ports_str_list:
+                self.banner_no_ports.set_revealed(revealed=True)
+        return GLib.SOURCE_REMOVE
 
 
     def on_btn_log(self, switch, _gparam):
         """ Logging switch action """
         if self.log_switch.props.active:
-            print("log switch active")
+            trace.debug("log switch active")
             self.write_logs = True
             folder = self.settings.get_string("log-folder")
 
@@ -435,10 +546,25 @@ class TaunoMonitorWindow(Adw.ApplicationWindow):
 
             # Now create file
             current_datetime = datetime.now().strftime("%Y-%m-%d-%H-%M-%S")
-            log_file_path = os.path.join(folder, f"tauno-monitor_log-{current_datetime}.txt")
-            self.log_file_exist = self.logging.create_file(log_file_path)
+            log_name = os.path.join(folder, f"tauno-monitor_log-{current_datetime}")
+            log_format = self.settings.get_string("log-format")
+            log_split = self.settings.get_string("log-split")
+            self.log_file_exist = False
+            if log_format in ('text', 'both'):
+                self.log_file_exist = self.logging.create_file(log_name + ".txt",
+                                                               self.tauno_serial.session,
+                                                               self.display_config)
+            if log_format in ('capture', 'both'):
+                if self.logging.create_capture(log_name + CAPTURE_EXTENSION,
+                                               self.tauno_serial.session, log_split):
+                    self.log_file_exist = True
+            if log_format in STRUCTURED_FORMATS:
+                extension = STRUCTURED_FORMATS[log_format].extension
+                if self.logging.create_structured(log_name + extension,
+                                                  self.tauno_serial.session, log_format):
+                    self.log_file_exist = True
         else:
-            print("log switch deactivate")
+            trace.debug("log switch deactivate")
             if self.log_file_exist:
                 self.logging.close_file()
             self.write_logs = False
@@ -456,6 +582,132 @@ class TaunoMonitorWindow(Adw.ApplicationWindow):
         tool_baud_window.present()
 
 
+    def on_btn_trace_dump(self, action, _):
+        """ Write trace ring buffer to log folder """
+        folder = os.path.expanduser(self.settings.get_string("log-folder"))
+        current_datetime = datetime.now().strftime("%Y-%m-%d-%H-%M-%S")
+        dump_path = os.path.join(folder, f"tauno-monitor_trace-{current_datetime}.txt")
+        try:
+            with open(dump_path, "x") as file_handle:
+                count = tauno_trace.dump(file_handle)
+        except OSError as e:
+            trace.error("Trace dump error: %s", e)
+            self.notify(f"Unable to write trace: {e}")
+            return
+        trace.info("Trace dump: %s", dump_path)
+        self.notify(f"{count} trace messages written to {dump_path}")
+
+
+    def on_btn_viewer(self, action, _):
+        """ Select log or capture file to view """
+        log_filter = Gtk.FileFilter()
+        log_filter.set_name("Logs and captures")
+        log_filter.add_pattern("*.txt")
+        log_filter.add_pattern("*.jsonl")
+        log_filter.add_pattern("*.csv")
+        log_filter.add_pattern("*" + CAPTURE_EXTENSION)
+        filters = Gio.ListStore.new(Gtk.FileFilter)
+        filters.append(log_filter)
+
+        dialog = Gtk.FileDialog()
+        dialog.set_filters(filters)
+        folder = os.path.expanduser(self.settings.get_string("log-folder"))
+        if os.path.isdir(folder):
+            dialog.set_initial_folder(Gio.File.new_for_path(folder))
+        dialog.open(self, None, self.on_viewer_file_selected)
+
+
+    def on_viewer_file_selected(self, dialog, task):
+        try:
+            log_file = dialog.open_finish(task)
+        except GLib.GError:
+            return
+        if log_file is None:
+            return
+        try:
+            source = open_source(log_file.get_path())
+        except (OSError, CaptureError) as e:
+            trace.error("Viewer: %s", e)
+            self.notify(f"Unable to open: {e}")
+            return
+        viewer_window = TaunoViewerWindow(source, application=self.get_application())
+        viewer_window.present()
+
+
+    def on_btn_replay(self, action, _):
+        """ Replay a capture file, or stop the running replay """
+        if self.replay is not None and self.replay.running:
+            self.replay.stop()
+            return
+
+        if self.tauno_serial.is_open:
+            self.notify("Close the serial port to replay a capture")
+            return
+
+        capture_filter = Gtk.FileFilter()
+        capture_filter.set_name("Tauno-Monitor capture")
+        capture_filter.add_pattern("*" + CAPTURE_EXTENSION)
+        filters = Gio.ListStore.new(Gtk.FileFilter)
+        filters.append(capture_filter)
+
+        # Select all streams of a split capture to replay them together
+        dialog = Gtk.FileDialog()
+        dialog.set_filters(filters)
+        dialog.open_multiple(self, None, self.on_replay_files_selected)
+
+
+    def on_replay_files_selected(self, dialog, task):
+        try:
+            capture_files = dialog.open_multiple_finish(task)
+        except GLib.GError:
+            return
+        file_paths = [capture_file.get_path() for capture_file in capture_files]
+        if file_paths:
+            self.start_replay(sorted(file_paths))
+
+
+    def start_replay(self, file_paths):
+        """ Feed capture to serial session as if it came from the port """
+        trace.info("Replay: %s", file_paths)
+        self.rx_queue.configure(self.settings.get_int("rx-queue-size"),
+                                self.settings.get_string("rx-queue-overflow"))
+        self.rx_queue.reset_stats()
+        self.update_rx_queue_info()
+
+        self.replay = CaptureReplay(file_paths, self.tauno_serial.session,
+                                    speed=self.settings.get_double("replay-speed"),
+                                    on_done=self.on_replay_done)
+        names = ", ".join(os.path.basename(file_path) for file_path in file_paths)
+        self.set_title("Replay: " + names)
+        self.logging.write_data("Replay " + ", ".join(file_paths) + "\n")
+        self.replay.start()
+
+
+    def on_replay_done(self, replay):
+        """ Called from replay thread """
+        GLib.idle_add(self.on_replay_finished, replay)
+
+
+    def on_replay_finished(self, replay):
+        """ Report replay speed when Text View has shown everything """
+        if not self.rx_queue.is_idle():
+            # Check again after next frame
+            GLib.timeout_add(20, self.on_replay_finished, replay)
+            return GLib.SOURCE_REMOVE
+
+        elapsed = time.monotonic() - replay.started
+        rate = replay.frames / elapsed if elapsed > 0 else 0
+        message = (f"Replayed {replay.frames} lines in {elapsed:.2f} s "
+                   f"({rate:.0f} lines/s, {self.rx_queue.dropped} dropped)")
+        trace.info(message)
+        self.notify(message)
+        if replay is self.replay:
+            self.replay = None
+            if not self.tauno_serial.is_open:
+                self.set_title(APP_NAME)
+        return GLib.SOURCE_REMOVE
+
+
     def on_btn_update_ports(self, action, _):
         """ Button Update ports list action """
         self.scan_serial_ports()
@@ -485,6 +737,11 @@ class TaunoMonitorWindow(Adw.ApplicationWindow):
             selected_port = self.settings.get_string("port-str")
             selected_baud_index = self.settings.get_int("baud-index")
             selected_baud_rate = self.baud_drop_down.get_selected_item().get_string()
+            # RX queue limit and counters
+            self.rx_queue.configure(self.settings.get_int("rx-queue-size"),
+                                    self.settings.get_string("rx-queue-overflow"))
+            self.rx_queue.reset_stats()
+            self.update_rx_queue_info()
             # Open Serial Port
             self.tauno_serial.open(selected_port, selected_baud_rate)
 
@@ -511,16 +768,14 @@ class TaunoMonitorWindow(Adw.ApplicationWindow):
         """ Thread to read serial port"""
         # THREAD version
         # https://pygobject.readthedocs.io/en/latest/guide/threading.html
-        thread = threading.Thread(target=self.tauno_serial.read)
-        thread.daemon = True
-        thread.start()
+        self.tauno_serial.start()
 
 
     def reconnect_serial(self, selected_port, selected_baudrate):
         """
-        Tries to reconnect the serial connection. Using the latest settings.
+        Tries to reconnect the serial connection to the same port and baud rate.
         """
-        print("Auto reconnecting serial ")
+        trace.info("Auto reconnecting serial ")
         self.tauno_serial.close()
 
         # Display notification
@@ -530,11 +785,9 @@ class TaunoMonitorWindow(Adw.ApplicationWindow):
 
         if self.reconnecting_serial:
             self.set_title("Reconnecting")
-            port_obj = self.port_drop_down.get_selected_item()
-            last_port = port_obj.get_string()
-
-            baud_obj = self.baud_drop_down.get_selected_item()
-            last_baud = baud_obj.get_string()
+            # Not from drop downs: port list can change while device is unplugged
+            last_port = selected_port
+            last_baud = selected_baudrate
 
             i = 0
             while self.tauno_serial.is_open == False and self.reconnecting_serial == True:
@@ -552,7 +805,7 @@ class TaunoMonitorWindow(Adw.ApplicationWindow):
 
             if self.tauno_serial.is_open:
                 self.set_title(str(last_port)+":"+str(last_baud))
-                print(" reconnected!")
+                trace.info(" reconnected!")
             else: # Close button is pressed
                 self.tauno_serial.close()
                 self.set_title(APP_NAME)
@@ -562,7 +815,7 @@ class TaunoMonitorWindow(Adw.ApplicationWindow):
         """
         Title animation
         """
-        print(".")
+        trace.debug(".")
         if i == 1:
             self.set_title("Reconnecting .")
         elif i == 2:
@@ -573,102 +826,228 @@ class TaunoMonitorWindow(Adw.ApplicationWindow):
              self.set_title("Reconnecting ")
 
 
-    def add_to_text_view(self, data):
+    def on_rx_queue_ready(self):
+        """
+        Called from serial thread when new data is waiting.
+        Starts frame clock callback in main loop.
+        """
+        GLib.idle_add(self.start_rx_tick)
+
+
+    def start_rx_tick(self):
+        """
+        Drain RX queue once per frame. Minimized or hidden window gets
+        no frame clock ticks, then a timer drains the queue.
+        """
+        self.rx_last_tick = time.monotonic()
+        self.rx_tick_id = self.input_text_view.add_tick_callback(self.on_rx_tick)
+        self.rx_fallback_id = GLib.timeout_add(RX_FALLBACK_MS, self.on_rx_fallback)
+        return GLib.SOURCE_REMOVE
+
+
+    def on_rx_tick(self, widget, frame_clock):
+        """ Frame clock tick. Stops when queue is empty. """
+        self.rx_last_tick = time.monotonic()
+        if self.drain_rx_queue():
+            return GLib.SOURCE_CONTINUE
+        self.rx_tick_id = None
+        if self.rx_fallback_id is not None:
+            GLib.source_remove(self.rx_fallback_id)
+            self.rx_fallback_id = None
+        return GLib.SOURCE_REMOVE
+
+
+    def on_rx_fallback(self):
+        """ Timer: drain when ticks are not coming. Stops when queue is empty. """
+        if (self.input_text_view.get_mapped() and
+                time.monotonic() - self.rx_last_tick < RX_FALLBACK_MS / 1000):
+            return GLib.SOURCE_CONTINUE
+        if self.drain_rx_queue():
+            return GLib.SOURCE_CONTINUE
+        self.rx_fallback_id = None
+        if self.rx_tick_id is not None:
+            self.input_text_view.remove_tick_callback(self.rx_tick_id)
+            self.rx_tick_id = None
+        return GLib.SOURCE_REMOVE
+
+
+    def drain_rx_queue(self):
+        """
+        Move all waiting RX data to Text View.
+        Returns False when queue is empty.
+        """
+        items = self.rx_queue.drain()
+        if not items:
+            return False
+
+        # Same settings for the whole frame
+        config = self.display_config
+        composer = LineComposer()
+        for frame in items:
+            self.add_to_text_view(frame, composer, config)
+
+        # Whole frame with one insert
+        self.insert_composed(composer)
+
+        self.trim_text_view()
+
+        # Scroll text view once per frame
+        self.input_text_view.scroll_to_mark(self.text_mark_end, 0, False, 0, 0)
+        self.update_rx_queue_info()
+        return True
+
+
+    def update_rx_queue_info(self):
+        """ Show RX queue counters on Info Sidebar """
+        stats = (self.rx_queue.dropped, self.rx_queue.high_water)
+        if stats != self.rx_queue_stats_shown:
+            self.rx_queue_stats_shown = stats
+            self.info_rx_dropped.set_label(str(stats[0]))
+            self.info_rx_high_water.set_label(str(stats[1]))
+
+
+    def on_display_settings_changed(self, settings, key):
+        """ Make new display settings snapshot """
+        if key in DisplayConfig.KEYS:
+            self.display_config = DisplayConfig.from_settings(settings)
+            self.tauno_serial.apply_config(self.display_config)
+            self.logging.set_display_config(self.display_config)
+
+
+    def on_rx_queue_settings_changed(self, settings, key):
+        """ RX queue limit is changed in preferences """
+        self.rx_queue.configure(settings.get_int("rx-queue-size"),
+                                settings.get_string("rx-queue-overflow"))
+
+
+    def on_scrollback_changed(self, settings, key):
+        """ Scrollback limit is changed in preferences """
+        self.scrollback_lines = self.settings.get_int("scrollback-lines")
+        self.scrollback_size = self.settings.get_int("scrollback-size")
+
+
+    def trim_text_view(self):
+        """
+        Delete oldest lines when Text View is over scrollback limit.
+        Waits until buffer is SCROLLBACK_SLACK over the limit and
+        then deletes all extra lines with one call.
+        """
+        buffer = self.text_buffer
+        cut = None
+
+        if self.scrollback_lines:
+            lines = buffer.get_line_count()
+            if lines > self.scrollback_lines * (1 + SCROLLBACK_SLACK):
+                found, cut = buffer.get_iter_at_line(lines - self.scrollback_lines)
+                if not found:
+                    cut = None
+
+        if self.scrollback_size:
+            limit = self.scrollback_size * 1024
+            chars = buffer.get_char_count()
+            if chars > limit * (1 + SCROLLBACK_SLACK):
+                size_cut = buffer.get_iter_at_offset(chars - limit)
+                # Keep whole lines
+                if not size_cut.starts_line():
+                    size_cut.forward_line()
+                if cut is None or size_cut.compare(cut) > 0:
+                    cut = size_cut
+
+        if cut is not None:
+            buffer.delete(buffer.get_start_iter(), cut)
+
+
+    def insert_composed(self, composer):
+        """
+        Insert composed text to Text View with one insert,
+        then apply its tags by offset. Two iters are moved
+        over the new text, no lookup per tag.
+        """
+        if composer.is_empty():
+            return
+        buffer = self.text_buffer
+        offset = buffer.get_char_count()
+        buffer.insert(buffer.get_end_iter(), composer.get_text())
+        start = buffer.get_iter_at_offset(offset)
+        end = start.copy()
+        for tag, tag_start, tag_end in composer.segments:
+            start.set_offset(offset + tag_start)
+            end.set_offset(offset + tag_end)
+            buffer.apply_tag(tag, start, end)
+
+
+    def insert_text_to_text_view(self, text, tag=None):
+        """ Insert plain text to Text View """
+        composer = LineComposer()
+        composer.add(text, tag)
+        self.insert_composed(composer)
+
+
+    def add_to_text_view(self, frame, composer, config):
         """
-        Update Text View
+        Compose RX or TX data line
         """
         try:
-            # Show data as HEX
-            if self.get_rx_format_saved == 'HEX':
-                self.insert_data_to_text_view(data, 'HEX')
-            elif self.get_rx_format_saved == 'DEC':
-                self.insert_data_to_text_view(data, 'DEC')
-            elif self.get_rx_format_saved == 'OCT':
-                self.insert_data_to_text_view(data, 'OCT')
-            # Show data as binary
-            elif self.get_rx_format_saved == 'BIN':
+            data = frame.data
+            rx_format = config.rx_format
+            # Sent data (live or replayed) is text
+            if frame.direction == 'TX':
+                self.compose_time(composer, config, frame.wall_time)
+                self.compose_arrow(composer, config, 'TX')
+                self.compose_data(composer, data.decode('utf-8', errors='replace'), 'TX')
+                self.compose_line_end(composer, config, 'TX')
+            # Show data as HEX, DEC or OCT stream
+            elif rx_format in ('HEX', 'DEC', 'OCT') and not config.framed:
+                self.compose_data(composer, data, rx_format)
+            # Show data as binary, or every frame on its own line
+            elif rx_format in BYTE_FORMATS:
                 # Timestamp
-                self.insert_time_to_text_view()
+                self.compose_time(composer, config, frame.wall_time)
                 # Arrow
-                self.insert_arrow_to_text_view('RX')
+                self.compose_arrow(composer, config, 'RX')
                 # Binary
-                self.insert_data_to_text_view(data, 'BIN')
+                self.compose_data(composer, data, rx_format)
                 # Line end
-                self.insert_line_end_to_text_view('RX')
+                self.compose_line_end(composer, config, 'RX')
             # Show data as ASCII chars == Plain text
             else:
                 # Timestamp
-                self.insert_time_to_text_view()
+                self.compose_time(composer, config, frame.wall_time)
                 # Arrow
-                self.insert_arrow_to_text_view('RX')
+                self.compose_arrow(composer, config, 'RX')
                 # data
-                self.insert_data_to_text_view(data, 'ASCII')
-                self.insert_line_end_to_text_view('RX')
-
-            # Scroll text view
-            self.input_text_view.scroll_to_mark(self.text_mark_end, 0, False, 0, 0)
+                text = frame.text
+                if text is None:
+                    text = data.decode('utf-8', errors=config.decode_errors)
+                self.compose_data(composer, text, 'ASCII')
+                self.compose_line_end(composer, config, 'RX')
         except Exception as ex:
-            print("add_to_text_view error:", ex)
+            trace.error("add_to_text_view error: %s", ex)
             return
 
 
-    def insert_data_to_text_view(self, data, type):
+    def compose_data(self, composer, data, type):
         """
-        Insert data to text view
-        Types 'HEX', 'ASCII', 'TX'
+        Add data to line
+        Types 'HEX', 'BIN', 'OCT', 'DEC' (bytes), 'ASCII', 'TX' (str)
         """
-        self.text_buffer = self.input_text_view.get_buffer()
-        self.text_iter_end = self.text_buffer.get_end_iter()
-        start_mark = self.text_buffer.create_mark('start_mark', self.text_buffer.get_end_iter(), True)
-
-        if type == 'HEX':
-            self.text_buffer.insert(self.text_iter_end, data.hex())
-            self.text_buffer.insert(self.text_iter_end, ' ')
-            self.logging.write_hex_data(data.hex())
-            tag = self.tag_in
-        elif type == 'BIN':
-            for byte in data:
-                # Pad with leading zeros to show the full byte
-                binary_8 = format(byte, '08b')
-                self.text_buffer.insert(self.text_iter_end, binary_8)
-                self.logging.write_data(binary_8)
-            tag = self.tag_in
-        elif type == 'OCT':
-            for byte in data:
-                octal_str = format(byte, '03o')
-                self.text_buffer.insert(self.text_iter_end, octal_str)
-                self.text_buffer.insert(self.text_iter_end, ' ')
-                self.logging.write_hex_data(octal_str)
-            tag = self.tag_in
-        elif type == 'DEC':
-            for byte in data:
-                octal_str = format(byte, '03d')
-                self.text_buffer.insert(self.text_iter_end, octal_str)
-                self.text_buffer.insert(self.text_iter_end, ' ')
-                self.logging.write_hex_data(octal_str)
-            tag = self.tag_in
+        if type in BYTE_FORMATS:
+            composer.add(format_bytes(data, type), self.tag_in)
         elif type == 'ASCII':
-            line = data.decode('utf-8').strip()
-            print(f"line: {line}")
-            self.text_buffer.insert(self.text_iter_end, line)
-            self.logging.write_data(line)
-            tag = self.tag_in
+            line = data.strip()
+            trace.debug("line: %s", line)
+            composer.add(line, self.tag_in)
         elif type == 'TX':
-            self.text_buffer.insert(self.text_iter_end, data)
-            self.logging.write_data(data)
-            tag = self.tag_out
+            composer.add(data, self.tag_out)
         else:
-            print("Wrong data type!")
-
-        end_mark = self.text_buffer.create_mark('end_mark', self.text_buffer.get_end_iter(), True)
-        self.text_buffer.apply_tag(tag, self.text_buffer.get_iter_at_mark(start_mark), self.text_buffer.get_iter_at_mark(end_mark))
+            trace.error("Wrong data type!")
 
 
-    def insert_arrow_to_text_view(self, type):
+    def compose_arrow(self, composer, config, type):
         """"
-        Display a arrow RX or TX
+        Add a arrow RX or TX
         """
-        is_arrow = self.settings.get_boolean("arrow")
+        is_arrow = config.arrow
 
         if type == 'TX':
             arrow = '<-- '  # TX
@@ -676,101 +1055,41 @@ class TaunoMonitorWindow(Adw.ApplicationWindow):
             arrow = '--> '  # RX
 
         if is_arrow:
-            self.text_buffer = self.input_text_view.get_buffer()
-            # start
-            arrow_start_mark = self.text_buffer.create_mark('arrow_start_mark', self.text_buffer.get_end_iter(), True)
-            # arrow
-            self.text_buffer.insert(self.text_iter_end, arrow)
-            # end
-            arrow_end_mark = self.text_buffer.create_mark('arrow_end_mark', self.text_buffer.get_end_iter(), True)
-            # tag
-            self.text_buffer.apply_tag(self.tag_arrow, self.text_buffer.get_iter_at_mark(arrow_start_mark), self.text_buffer.get_iter_at_mark(arrow_end_mark))
-            # Log arrow
-            self.logging.write_data(arrow)
+            composer.add(arrow, self.tag_arrow)
 
 
-    def insert_time_to_text_view(self):
+    def compose_time(self, composer, config, wall_time=None):
         """
         Add timestamp if needed
+        wall_time: time.time() when data was received, None = now
         """
-        is_timestamp = self.settings.get_boolean("timestamp")
+        is_timestamp = config.timestamp
 
         if is_timestamp:
             # Get time
-            now = datetime.now()
+            if wall_time is None:
+                now = datetime.now()
+            else:
+                now = datetime.fromtimestamp(wall_time)
             current_time = now.strftime("%H:%M:%S.%f ")
-            # Buffer
-            self.text_buffer = self.input_text_view.get_buffer()
-            # Start
-            time_start_mark = self.text_buffer.create_mark('time_start_mark', self.text_buffer.get_end_iter(), True)
-            # Time
-            self.text_buffer.insert(self.text_iter_end, current_time)
-            # End
-            time_end_mark = self.text_buffer.create_mark('time_end_mark', self.text_buffer.get_end_iter(), True)
-            # Tag
-            self.text_buffer.apply_tag(self.tag_time, self.text_buffer.get_iter_at_mark(time_start_mark), self.text_buffer.get_iter_at_mark(time_end_mark))
-            # Log
-            self.logging.write_data(current_time)
-
-
-    def insert_line_end_to_text_view(self, direction):
+            composer.add(current_time, self.tag_time)
+
+
+    def compose_line_end(self, composer, config, direction):
         """
         Add line end for text-view and real
         """
-        show_line_end = self.settings.get_boolean("show-line-end")
-
-        if direction == 'TX':
-            index = self.settings.get_int("saved-serial-tx-line-end-index")
-            show_end = self.serial_tx_line_endings[index]
-        if direction == 'RX':
-            index = self.settings.get_int("saved-serial-rx-line-end-index")
-            print(index)
-            if index == 4: #None
-                show_end = ''
-            else:
-                show_end = self.serial_rx_line_endings[index]
+        if direction == 'RX' and config.framed:
+            # Frame is not ended by a line end
+            composer.add('\n')
+            return
 
+        show_end, real_end = config.line_end(direction)
         # Add line end for show
-        if show_line_end:
-
-            # Buffer
-            self.text_buffer = self.input_text_view.get_buffer()
-
-            # Start mark
-            line_end_start_mark = self.text_buffer.create_mark('line_end_start_mark', self.text_buffer.get_end_iter(), True)
-
-            # Insert line end
-            self.text_buffer.insert(self.text_iter_end, show_end)
-
-            # End mark
-            line_end_end_mark = self.text_buffer.create_mark('line_end_end_mark', self.text_buffer.get_end_iter(), True)
-
-            # Tag
-            self.text_buffer.apply_tag(self.tag_line_end, self.text_buffer.get_iter_at_mark(line_end_start_mark), self.text_buffer.get_iter_at_mark(line_end_end_mark))
-
-            # Log
-            self.logging.write_data(show_end)
+        if config.show_line_end:
+            composer.add(show_end, self.tag_line_end)
         # Add real line end
-        if index == 1:
-            self.text_buffer.insert(self.text_iter_end, '\r')
-            # Log
-            self.logging.write_data('\r')
-        elif index == 2:
-            self.text_buffer.insert(self.text_iter_end, '\r\n')
-            # Log
-            self.logging.write_data('\r\n')
-        elif index == 3:
-            self.text_buffer.insert(self.text_iter_end, ';')
-            # Log
-            self.logging.write_data(';')
-        elif index == 4: #none
-            self.text_buffer.insert(self.text_iter_end, '')
-            # Log
-            self.logging.write_data('')
-        else:
-            self.text_buffer.insert(self.text_iter_end, '\n')
-            # Log
-            self.logging.write_data('\n')
+        composer.add(real_end)
 
 
     def on_btn_send(self, action, _):
@@ -823,15 +1142,11 @@ class TaunoMonitorWindow(Adw.ApplicationWindow):
             end = '\r\n'
 
         data = data + end
+        # Sent data is shown and logged from the session TX frame
         if self.tauno_serial.is_open:
             self.tauno_serial.write(data)
         else:
-            print("Send cmd: Serial is not Open")
-
-        self.insert_time_to_text_view()
-        self.insert_arrow_to_text_view('TX')
-        self.insert_data_to_text_view(data, 'TX')
-        self.insert_line_end_to_text_view('TX')
+            trace.warning("Send cmd: Serial is not Open")
 
 
     def notify(self, message):
@@ -847,7 +1162,7 @@ class TaunoMonitorWindow(Adw.ApplicationWindow):
         try:
             selected_item = widget.get_selected_item()
             selected_str = selected_item.get_string()
-            print(f"Selected port: {selected_str}")
+            trace.debug("Selected port: %s", selected_str)
             # Add to Info Sidebar:
             self.info_port_value.set_label(selected_str)
             # save port to settings
@@ -855,7 +1170,7 @@ class TaunoMonitorWindow(Adw.ApplicationWindow):
             # Get info
             self.get_port_info(selected_str)
         except Exception as ex:
-            print("Ports are not available!")
+            trace.warning("Ports are not available!")
             #print("Port selection error:", ex)
 
 
@@ -864,13 +1179,13 @@ class TaunoMonitorWindow(Adw.ApplicationWindow):
         selected_item = widget.get_selected_item()
 
         selected_str = selected_item.get_string()
-        print(f"Selected baud: {selected_str}")
+        trace.debug("Selected baud: %s", selected_str)
         # Add to Info Sidebar:
         self.info_baud_value.set_label(selected_str)
         # save baud settings to settings
         baud_index_new = widget.get_selected()
         baud_index_new = int(baud_index_new)
-        print(f"Baud index: {baud_index_new}")
+        trace.debug("Baud index: %s", baud_index_new)
         self.settings.set_int("baud-index", baud_index_new)
 
 
@@ -881,52 +1196,52 @@ class TaunoMonitorWindow(Adw.ApplicationWindow):
             if port.device == port_name:
                 #print(f"Port          : {port.device}")
 
-                print(f"Name          : {port.name}")
+                trace.debug("Name          : %s", port.name)
                 if port.name == None:
                     self.info_Name.set_label("None")
                 else:
                     self.info_Name.set_label(port.name)
 
-                print(f"Description   : {port.description}")
+                trace.debug("Description   : %s", port.description)
                 if port.description == None:
                     self.info_Description.set_label("None")
                 else:
                     self.info_Description.set_label(port.description)
 
-                print(f"HWID          : {port.hwid}")#raw hex
+                trace.debug("HWID          : %s", port.hwid)  # raw hex
                 self.parse_hwid(port.hwid)
 
-                print(f"VID           : {port.vid}")
+                trace.debug("VID           : %s", port.vid)
                 #self.info_VID.set_label(str(port.vid))#int
 
-                print(f"PID           : {port.pid}")
+                trace.debug("PID           : %s", port.pid)
                 #self.info_PID.set_label(str(port.pid))#int
 
-                print(f"Serial Number : {port.serial_number}")
+                trace.debug("Serial Number : %s", port.serial_number)
                 if port.serial_number == None:
                     self.info_Serial_Number.set_label("None")
                 else:
                     self.info_Serial_Number.set_label(str(port.serial_number))
 
-                print(f"Location      : {port.location}")
+                trace.debug("Location      : %s", port.location)
                 if port.location == None:
                     self.info_Location.set_label("None")
                 else:
                     self.info_Location.set_label(port.location)
 
-                print(f"Manufacturer  : {port.manufacturer}")
+                trace.debug("Manufacturer  : %s", port.manufacturer)
                 if port.manufacturer == None:
                     self.info_Manufacturer.set_label("None")
                 else:
                     self.info_Manufacturer.set_label(port.manufacturer)
 
-                print(f"Product       : {port.product}")
+                trace.debug("Product       : %s", port.product)
                 if port.product == None:
                     self.info_Product.set_label("None")
                 else:
                     self.info_Product.set_label(port.product)
 
-                print(f"Interface     : {port.interface}")
+                trace.debug("Interface     : %s", port.interface)
                 if port.interface == None:
                     self.info_Interface.set_label("None")
                 else:
@@ -937,17 +1252,41 @@ class TaunoMonitorWindow(Adw.ApplicationWindow):
                 """
                 try:
                     with serial.Serial(port.device, timeout=1) as ser:
-                        print("Opened successfully.")
-                        print(f"Baudrate      : {ser.baudrate}")
-                        print(f"Bytesize      : {ser.bytesize}")
-                        print(f"Parity        : {ser.parity}")
-                        print(f"Stopbits      : {ser.stopbits}")
-                        print(f"Timeout       : {ser.timeout}")
+                        trace.info("Opened successfully.")
+                        trace.debug("Baudrate      : %s", ser.baudrate)
+                        trace.debug("Bytesize      : %s", ser.bytesize)
+                        trace.debug("Parity        : %s", ser.parity)
+                        trace.debug("Stopbits      : %s", ser.stopbits)
+                        trace.debug("Timeout       : %s", ser.timeout)
                 except Exception as e:
-                    print(f"Could not open port: {e}")
+                    trace.warning("Could not open port: %s", e)
                 break
                 """
 
+    def on_usb_ids_loaded(self):
+        """ Loader thread: names of the port selected before loading ended """
+        ids = self.usb_ids
+        if ids is not None:
+            GLib.idle_add(self.show_usb_names, *ids)
+
+
+    def show_usb_names(self, vid, pid):
+        """ Vendor and product names to Sidebar """
+        if (vid, pid) != self.usb_ids:
+            # Other port was selected meanwhile
+            return False
+        vendor_name, product = tauno_usb.lookup(vid, pid)
+        if vendor_name == None:
+            self.info_VID_Vendor.set_label("None")
+        else:
+            self.info_VID_Vendor.set_label(vendor_name)
+        if product == None:
+            self.info_PID_Product.set_label("None")
+        else:
+            self.info_PID_Product.set_label(product)
+        return False
+
+
     def parse_hwid(self, hwid_str):
         """
         Split HWID
@@ -962,18 +1301,15 @@ class TaunoMonitorWindow(Adw.ApplicationWindow):
             self.info_VID.set_label(str(result['VID']))#hex
             self.info_PID.set_label(str(result['PID']))#hex
 
-            vendor = usb_db.get(result['VID'], {})
-            vendor_name = vendor.get("name")
-            product = vendor.get("products", {}).get(result['PID'])
-            # Add to Sidebar
-            if vendor_name == None:
-                self.info_VID_Vendor.set_label("None")
-            else:
-                self.info_VID_Vendor.set_label(vendor_name.strip())
-            if product == None:
-                self.info_PID_Product.set_label("None")
+            self.usb_ids = (result['VID'], result['PID'])
+            if tauno_usb.is_loaded():
+                self.show_usb_names(*self.usb_ids)
             else:
-                self.info_PID_Product.set_label(product.strip())
+                # Names are shown when database is loaded
+                self.info_VID_Vendor.set_label("...")
+                self.info_PID_Product.set_label("...")
+                ids = self.usb_ids
+                tauno_usb.preload(lambda: GLib.idle_add(self.show_usb_names, *ids))
 
 
         # Match Serial Number
@@ -993,10 +1329,10 @@ class TaunoMonitorWindow(Adw.ApplicationWindow):
         # Get selected index
         string_object = drop_down.get_selected_item()
         index = drop_down.get_selected()
-        print(f'Selected TX Line End Pos: {index} val: {string_object.get_string()}')
+        trace.debug('Selected TX Line End Pos: %s val: %s', index, string_object.get_string())
         # Save index
         if self.get_TX_line_end_saved != index:
-            print("Saving TX Line End index")
+            trace.debug("Saving TX Line End index")
             self.settings.set_int("saved-serial-tx-line-end-index", index)
             # Reload setting
             self.get_TX_line_end_saved = self.settings.get_int("saved-serial-tx-line-end-index")
@@ -1009,10 +1345,10 @@ class TaunoMonitorWindow(Adw.ApplicationWindow):
         # Get selected index
         string_object = drop_down.get_selected_item()
         index = drop_down.get_selected()
-        print(f'Selected RX Line End Pos: {index} val: {string_object.get_string()}')
+        trace.debug('Selected RX Line End Pos: %s val: %s', index, string_object.get_string())
         # Save index
         if self.get_RX_line_end_saved != index:
-            print("Saving RX Line End index")
+            trace.debug("Saving RX Line End index")
             self.settings.set_int("saved-serial-rx-line-end-index", index)
             # Reload setting
             self.get_RX_line_end_saved = self.settings.get_int("saved-serial-rx-line-end-index")